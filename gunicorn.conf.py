@@ -0,0 +1,78 @@
+"""Gunicorn settings for production, loaded from the working directory.
+
+The app is imported once in the master (which compiles every template, see
+``WARM_TEMPLATES_ON_BOOT``) and forked, so workers share that memory
+copy-on-write. Each worker then opens its database connections before it
+takes traffic. Every value can be overridden from the environment.
+"""
+
+import gc
+import os
+
+
+def available_cpus():
+    """CPUs this process may run on (honours container CPU sets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS.
+        return os.cpu_count() or 1
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+workers = int(os.environ.get("WEB_CONCURRENCY", available_cpus() + 1))
+
+# SERVER_MODE (also read by the settings) picks the interface.
+if os.environ.get("SERVER_MODE", "wsgi") == "asgi":
+    # Each uvicorn worker runs an event loop; the task views are async, so a
+    # request waiting on the database does not hold one of a fixed number of
+    # threads and concurrency is bounded by the connection pools instead.
+    wsgi_app = "syafiqkaydotcom.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    # Requests mostly wait on the database, so each process serves a few at
+    # once on threads; fewer processes keep memory down.
+    wsgi_app = "syafiqkaydotcom.wsgi:application"
+    worker_class = "gthread"
+    threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Recycle workers to bound slow leaks; the jitter keeps them from all
+# restarting at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+# The heartbeat file is touched constantly; keep it off the container's
+# overlay file system.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from syafiqkaydotcom.warmup import close_connection_pools
+
+    # Move everything loaded so far out of the garbage collector's reach, so
+    # collections in the workers do not touch (and copy) the shared pages.
+    gc.freeze()
+    # Workers must open their own connections.
+    close_connection_pools()
+
+
+def post_fork(server, worker):
+    # Without preload the app is not loaded yet; the worker compiles its
+    # templates while importing it and connects on the first request.
+    if not server.cfg.preload_app:
+        return
+    from syafiqkaydotcom.warmup import warm_database_connections
+
+    failed = warm_database_connections()
+    if failed:
+        server.log.warning("Worker %s could not connect to %s.", worker.pid, failed)
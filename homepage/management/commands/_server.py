@@ -0,0 +1,46 @@
+"""Helpers for commands that start the site in a subprocess and probe it."""
+
+import importlib.util
+import socket
+import sys
+import time
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url, timeout=30, process=None):
+    """Poll ``url`` until it answers 2xx/3xx; fail if ``process`` exits first."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise CommandError(f"Server exited with status {process.returncode}.")
+        try:
+            urllib.request.urlopen(url, timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise CommandError(f"{url} did not come up within {timeout}s.")
+
+
+def server_command(port, serve_static=False):
+    """Serve the site on ``port`` with gunicorn, as production does.
+
+    Falls back to runserver when gunicorn is not installed, or when the
+    caller needs static files served too.
+    """
+    if not serve_static and importlib.util.find_spec("gunicorn"):
+        return [
+            sys.executable, "-m", "gunicorn", "syafiqkaydotcom.wsgi:application",
+            "--bind", f"127.0.0.1:{port}",
+        ]
+    manage = str(settings.BASE_DIR / "manage.py")
+    # --insecure serves static files the way DEBUG does.
+    return [sys.executable, manage, "runserver", "--noreload", "--insecure", str(port)]
@@ -0,0 +1,98 @@
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Load the WSGI application and serve one request, as a fresh worker does.
+WORKER_SCRIPT = """
+import io, sys
+from syafiqkaydotcom.wsgi import application
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": "/", "SERVER_NAME": "localhost",
+    "SERVER_PORT": "80", "HTTP_HOST": "localhost", "wsgi.input": io.BytesIO(),
+    "wsgi.url_scheme": "http", "wsgi.errors": sys.stderr,
+}
+statuses = []
+b"".join(application(environ, lambda status, headers: statuses.append(status)))
+assert statuses[0].startswith("200"), statuses
+"""
+
+SCENARIOS = {
+    "manage.py check": [sys.executable, "manage.py", "check"],
+    "manage.py help": [sys.executable, "manage.py", "help"],
+    "worker boot": [sys.executable, "-c", WORKER_SCRIPT],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure process start-up in fresh interpreters: management commands, "
+        "and a worker loading the WSGI application and serving the homepage. "
+        "With --baseline, the same runs against a git revision checked out in "
+        "a temporary worktree are reported as 'before'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=10)
+        parser.add_argument(
+            "--baseline", help="Git revision to compare against, e.g. HEAD~1."
+        )
+
+    def handle(self, *args, **options):
+        runs = options["runs"]
+        if not options["baseline"]:
+            for label, command in SCENARIOS.items():
+                after = self._time(command, settings.BASE_DIR, runs)
+                self.stdout.write(f"  {label:<16} median {after * 1000:6.0f} ms")
+            return
+
+        with tempfile.TemporaryDirectory() as parent:
+            worktree = Path(parent) / "baseline"
+            self._git("worktree", "add", "--detach", worktree, options["baseline"])
+            try:
+                for label, command in SCENARIOS.items():
+                    # Alternate the trees so machine noise hits both alike.
+                    before, after = [], []
+                    for _ in range(runs):
+                        before.append(self._time(command, worktree, 1))
+                        after.append(self._time(command, settings.BASE_DIR, 1))
+                    before, after = statistics.median(before), statistics.median(after)
+                    self.stdout.write(self.style.MIGRATE_HEADING(label))
+                    self.stdout.write(f"  before  median {before * 1000:6.0f} ms")
+                    self.stdout.write(
+                        f"  after   median {after * 1000:6.0f} ms"
+                        f"   ({(1 - after / before) * 100:.0f}% less time)"
+                    )
+            finally:
+                self._git("worktree", "remove", "--force", worktree)
+
+    @staticmethod
+    def _git(*args):
+        result = subprocess.run(
+            ["git", *map(str, args)],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip())
+
+    @staticmethod
+    def _time(command, cwd, runs):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(
+                command,
+                check=True,
+                cwd=cwd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
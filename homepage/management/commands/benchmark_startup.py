@@ -0,0 +1,68 @@
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ._server import free_port, server_command, wait_until_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure container cold start: seconds from launch until the homepage "
+        "answers, with the deploy steps chained in front of the server (before) "
+        "and with the server started directly (after)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument(
+            "--with-static",
+            action="store_true",
+            help="Include collectstatic_incremental in the chained steps "
+            "(needs working static storage credentials).",
+        )
+
+    def handle(self, *args, **options):
+        manage = [sys.executable, str(settings.BASE_DIR / "manage.py")]
+        # --dry-run so the benchmark never writes migration files.
+        steps = [[*manage, "makemigrations", "--dry-run"], [*manage, "migrate"]]
+        if options["with_static"]:
+            steps.insert(0, [*manage, "collectstatic_incremental"])
+
+        # The database is already migrated, as it would be after the first
+        # replica of a deploy; what remains is the per-replica cost.
+        subprocess.run(steps[-1], check=True, stdout=subprocess.DEVNULL)
+
+        before = self._time_startup(steps, options["runs"])
+        after = self._time_startup([], options["runs"])
+        self.stdout.write(f"  before  median {before:6.2f} s   (steps + server)")
+        self.stdout.write(
+            f"  after   median {after:6.2f} s   (server only, "
+            f"{(1 - after / before) * 100:.0f}% less time)"
+        )
+
+    @staticmethod
+    def _time_startup(steps, runs):
+        timings = []
+        for _ in range(runs):
+            port = free_port()
+            command = " && ".join(
+                shlex.join(step) for step in [*steps, ["exec", *server_command(port)]]
+            )
+            started = time.perf_counter()
+            process = subprocess.Popen(
+                ["sh", "-c", command],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_until_up(f"http://127.0.0.1:{port}/", timeout=120, process=process)
+                timings.append(time.perf_counter() - started)
+            finally:
+                process.terminate()
+                process.wait()
+        return statistics.median(timings)
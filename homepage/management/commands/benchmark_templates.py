@@ -0,0 +1,50 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+DUMMY_CACHE = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request template render time for public pages with "
+        "fragment caching disabled (before) and enabled (after)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--templates",
+            nargs="+",
+            default=["homepage/base.html", "taskmanager/help.html"],
+        )
+        parser.add_argument("--repeat", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get("/")
+        without_fragments = {**settings.CACHES, "template_fragments": DUMMY_CACHE}
+
+        for name in options["templates"]:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            with override_settings(CACHES=without_fragments):
+                before = self._time(name, request, options["repeat"])
+            after = self._time(name, request, options["repeat"])
+            self.stdout.write(f"  before  median {before * 1000:7.1f} µs")
+            self.stdout.write(
+                f"  after   median {after * 1000:7.1f} µs"
+                f"   ({(1 - after / before) * 100:.0f}% less time)"
+            )
+
+    @staticmethod
+    def _time(name, request, repeat):
+        render_to_string(name, request=request)  # compile and fill caches
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render_to_string(name, request=request)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from syafiqkaydotcom.assets import IntegrityError, build_bundles, fetch_vendor_files
+
+
+class Command(BaseCommand):
+    help = (
+        "Vendor Bootstrap and jQuery, drop CSS rules for classes the templates "
+        "never use, and write one CSS and one JS bundle to static/dist/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Use files already in static/vendor/ instead of downloading.",
+        )
+
+    def handle(self, *args, **options):
+        static_dir = settings.BASE_DIR / "static"
+        vendor_dir = static_dir / "vendor"
+        try:
+            if not options["offline"]:
+                fetch_vendor_files(vendor_dir)
+        except (IntegrityError, OSError) as exc:
+            raise CommandError(f"Could not vendor assets: {exc}") from exc
+
+        template_dirs = [
+            directory for engine in settings.TEMPLATES for directory in engine["DIRS"]
+        ]
+        sizes = build_bundles(vendor_dir, static_dir / "dist", template_dirs)
+        for name, (before, after) in sizes.items():
+            self.stdout.write(f"dist/{name}: {before:,} -> {after:,} bytes")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from syafiqkaydotcom.cache import PAGE_CACHE_ALIAS, clear_page_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Drop every cached page. Deploys that change BUILD_VERSION invalidate "
+        "pages automatically; use this after editing content without a rebuild."
+    )
+
+    def handle(self, *args, **options):
+        clear_page_cache()
+        self.stdout.write(f"Cleared the '{PAGE_CACHE_ALIAS}' cache.")
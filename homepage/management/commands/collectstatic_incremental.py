@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from syafiqkaydotcom.staticsync import sync_static
+
+
+class Command(BaseCommand):
+    help = (
+        "Collect static files into STATICFILES_STORAGE, uploading only files "
+        "whose content changed since the last run, several at a time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Maximum concurrent uploads (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = sync_static(workers=options["workers"])
+        if options["verbosity"] >= 2:
+            for path in result.uploaded:
+                self.stdout.write(f"Uploaded '{path}'")
+        self.stdout.write(
+            f"{len(result.uploaded)} of {result.found} static files uploaded, "
+            f"{result.post_processed} post-processed in "
+            f"{time.perf_counter() - started:.1f}s."
+        )
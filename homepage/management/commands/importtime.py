@@ -0,0 +1,103 @@
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Start-up stages a fresh process can be stopped after; any other target is
+# run as a management command.
+SCRIPTS = {
+    "settings": "from django.conf import settings; settings.INSTALLED_APPS",
+    "setup": "import django; django.setup()",
+    "wsgi": "import syafiqkaydotcom.wsgi",
+    "asgi": "import syafiqkaydotcom.asgi",
+}
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| +(\S+)$")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output):
+    """Parse the ``-X importtime`` lines in ``output`` into ``ImportTiming``s."""
+    timings = []
+    for line in output.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us)))
+    return timings
+
+
+def measure_imports(target):
+    """Start ``target`` in a fresh interpreter and return its import timings."""
+    if target in SCRIPTS:
+        command = [sys.executable, "-X", "importtime", "-c", SCRIPTS[target]]
+    else:
+        manage = str(settings.BASE_DIR / "manage.py")
+        command = [sys.executable, "-X", "importtime", manage, target]
+    result = subprocess.run(
+        command,
+        cwd=settings.BASE_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode:
+        raise CommandError(f"{target} exited with status {result.returncode}.")
+    return parse_importtime(result.stderr)
+
+
+def by_package(timings):
+    """Sum self time per top-level package, slowest first."""
+    totals = defaultdict(lambda: [0, 0])
+    for timing in timings:
+        total = totals[timing.module.partition(".")[0]]
+        total[0] += timing.self_us
+        total[1] += 1
+    return sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Report what a fresh process imports while starting up, slowest first, "
+        "from `python -X importtime`. TARGET is settings, setup, wsgi, asgi or "
+        "the name of a management command."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", nargs="?", default="wsgi")
+        parser.add_argument("--top", type=int, default=25)
+        parser.add_argument(
+            "--by-package",
+            action="store_true",
+            help="Group by top-level package instead of listing modules.",
+        )
+
+    def handle(self, *args, **options):
+        timings = measure_imports(options["target"])
+        total = sum(timing.self_us for timing in timings)
+        self.stdout.write(
+            f"{options['target']}: {len(timings)} modules, "
+            f"{total / 1000:.1f} ms importing"
+        )
+        if options["by_package"]:
+            self.stdout.write(f"  {'self':>9}  {'modules':>7}  package")
+            for package, (self_us, count) in by_package(timings)[: options["top"]]:
+                self.stdout.write(f"  {self_us / 1000:6.1f} ms  {count:7}  {package}")
+            return
+        self.stdout.write(f"  {'cumulative':>10}  {'self':>9}  module")
+        slowest = sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)
+        for timing in slowest[: options["top"]]:
+            self.stdout.write(
+                f"  {timing.cumulative_us / 1000:7.1f} ms  "
+                f"{timing.self_us / 1000:6.1f} ms  {timing.module}"
+            )
@@ -0,0 +1,116 @@
+import statistics
+import subprocess
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ._server import free_port, server_command, wait_until_up
+
+# Lighthouse's mobile "Slow 4G" profile.
+THROTTLING = {
+    "offline": False,
+    "latency": 150,
+    "downloadThroughput": 1.6 * 1024 * 1024 / 8,
+    "uploadThroughput": 750 * 1024 / 8,
+}
+
+PAINT_TIMINGS = """() => {
+    const paint = performance.getEntriesByName("first-contentful-paint")[0];
+    const navigation = performance.getEntriesByType("navigation")[0];
+    return {
+        fcp: paint ? paint.startTime : null,
+        dcl: navigation.domContentLoadedEventEnd,
+    };
+}"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Load pages in headless Chromium with a cold cache and report "
+        "first-contentful-paint timings. Starts runserver unless --url is given. "
+        "Needs `pip install playwright && playwright install chromium`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="*", default=["/", "/taskmanager/", "/taskmanager/help/"]
+        )
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument(
+            "--url", help="Measure an already running server at this base URL."
+        )
+        parser.add_argument(
+            "--no-throttle",
+            action="store_true",
+            help="Measure at full local speed instead of Slow 4G.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from playwright.sync_api import sync_playwright
+        except ImportError:
+            raise CommandError(
+                "measure_fcp needs Playwright: "
+                "pip install playwright && playwright install chromium"
+            ) from None
+
+        server = None
+        base_url = options["url"]
+        if not base_url:
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server = subprocess.Popen(
+                server_command(port, serve_static=True),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        try:
+            if server:
+                wait_until_up(base_url + "/", process=server)
+            with sync_playwright() as playwright:
+                browser = playwright.chromium.launch()
+                try:
+                    for path in options["paths"]:
+                        timings = [
+                            self._measure(browser, base_url + path, options)
+                            for _ in range(options["runs"])
+                        ]
+                        self._report(path, timings)
+                finally:
+                    browser.close()
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+
+    @staticmethod
+    def _measure(browser, url, options):
+        # A fresh context per run: no HTTP cache, cookies or service workers.
+        context = browser.new_context()
+        try:
+            page = context.new_page()
+            if not options["no_throttle"]:
+                session = context.new_cdp_session(page)
+                session.send("Network.enable")
+                session.send("Network.emulateNetworkConditions", THROTTLING)
+            response = page.goto(url, wait_until="load")
+            if response is None or not response.ok:
+                status = response.status if response else "no response"
+                raise CommandError(f"{url} returned {status}.")
+            return page.evaluate(PAINT_TIMINGS)
+        finally:
+            context.close()
+
+    def _report(self, path, timings):
+        fcp = [timing["fcp"] for timing in timings if timing["fcp"] is not None]
+        dcl = [timing["dcl"] for timing in timings]
+        self.stdout.write(self.style.MIGRATE_HEADING(path))
+        if fcp:
+            self.stdout.write(
+                f"  first-contentful-paint  median {statistics.median(fcp):7.0f} ms"
+                f"   min {min(fcp):7.0f} ms   max {max(fcp):7.0f} ms"
+            )
+        else:
+            self.stdout.write("  first-contentful-paint  not reported")
+        self.stdout.write(
+            f"  DOMContentLoaded        median {statistics.median(dcl):7.0f} ms"
+        )
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+# Pages that render the same HTML for every anonymous visitor.
+DEFAULT_PAGES = ["homepage:homepage", "taskmanager:help"]
+
+
+def page_storage():
+    """Build ``PRERENDER_STORAGE``, which writes where the static files live.
+
+    Not ``staticfiles_storage`` itself: manifest storages refuse to give a
+    URL for any name missing from their manifest, and pages never are in it.
+    """
+    config = settings.PRERENDER_STORAGE
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+def page_filename(path):
+    """Map a URL path to the file that serves it, e.g. ``/a/`` -> ``a/index.html``."""
+    path = path.strip("/")
+    return f"{path}/index.html" if path else "index.html"
+
+
+class Command(BaseCommand):
+    help = (
+        "Render public pages to static HTML and upload them next to the static "
+        "files through PRERENDER_STORAGE, or write them to --output."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "pages",
+            nargs="*",
+            default=DEFAULT_PAGES,
+            help="URL names to render (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write HTML files into this directory instead of uploading.",
+        )
+        parser.add_argument(
+            "--prefix",
+            default="pages",
+            help="Storage path prefix for uploaded pages.",
+        )
+
+    def handle(self, *args, **options):
+        # Render through the full middleware stack, as an anonymous visitor
+        # on the canonical host, so the HTML matches what gunicorn serves.
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0], secure=True)
+        storage = None if options["output"] else page_storage()
+        for url_name in options["pages"]:
+            path = reverse(url_name)
+            response = client.get(path)
+            if response.status_code != 200:
+                raise CommandError(f"{path} returned {response.status_code}.")
+            filename = page_filename(path)
+            if options["output"]:
+                target = Path(options["output"]) / filename
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(response.content)
+            else:
+                name = f"{options['prefix']}/{filename}"
+                target = self._upload(storage, name, response.content)
+            self.stdout.write(f"{path} -> {target}")
+
+    @staticmethod
+    def _upload(storage, name, content):
+        if storage.exists(name):
+            storage.delete(name)
+        saved = storage.save(name, ContentFile(content))
+        return storage.url(saved)
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from syafiqkaydotcom.profiling import HEADER, make_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Print a signed header that makes the server profile the requests "
+        "carrying it, e.g. curl -H \"$(manage.py profile_token)\" URL."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{HEADER}: {make_token()}")
+        self.stderr.write(
+            f"Valid for {settings.PROFILING_TOKEN_MAX_AGE} seconds with this "
+            f"SECRET_KEY."
+        )
@@ -0,0 +1,64 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from syafiqkaydotcom.db.locks import LockTimeout, advisory_lock
+
+LOCK_NAME = "syafiqkaydotcom.release"
+
+
+def pending_migrations(using):
+    executor = MigrationExecutor(connections[using])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the once-per-deploy steps before web containers start: check for "
+        "missing migrations, upload changed static files and apply migrations. "
+        "Safe to run from several containers at once; migrations are applied "
+        "under a database lock by whichever gets it first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--skip-static",
+            action="store_true",
+            help="Do not run collectstatic_incremental.",
+        )
+        parser.add_argument(
+            "--lock-timeout",
+            type=float,
+            default=600,
+            help="Seconds to wait for another release to finish migrating.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        verbosity = options["verbosity"]
+        # Migrations are generated in development and committed; a release
+        # must never create them. Fails if models and migrations disagree.
+        call_command("makemigrations", check=True, dry_run=True, verbosity=0)
+
+        if not options["skip_static"]:
+            call_command("collectstatic_incremental", verbosity=verbosity)
+
+        if not pending_migrations(using):
+            self.stdout.write("No migrations to apply.")
+            return
+        try:
+            with advisory_lock(LOCK_NAME, using, timeout=options["lock_timeout"]):
+                # Another container may have migrated while we waited.
+                if pending_migrations(using):
+                    call_command(
+                        "migrate",
+                        database=using,
+                        interactive=False,
+                        verbosity=verbosity,
+                    )
+                else:
+                    self.stdout.write("Migrations were applied by another release.")
+        except LockTimeout as exc:
+            raise CommandError(str(exc)) from exc
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from syafiqkaydotcom.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile every template under the project templates directory into "
+        "the cached loader and report how long it took. Fails if any "
+        "template has a syntax error."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--include-apps",
+            action="store_true",
+            help="Also compile templates shipped inside installed apps.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        compiled, errors = warm_templates(options["include_apps"])
+        elapsed = (time.perf_counter() - started) * 1000
+        for name, error in errors.items():
+            self.stderr.write(f"{name}: {error}")
+        self.stdout.write(f"Compiled {compiled} templates in {elapsed:.1f} ms.")
+        if errors:
+            raise CommandError(f"{len(errors)} templates failed to compile.")
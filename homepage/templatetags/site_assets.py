@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@register.simple_tag
+def critical_css(layout):
+    """Return the above-the-fold CSS built for ``layout`` by ``build_assets``.
+
+    Read from the local static source tree rather than through the storage
+    backend. Returns an empty string if the assets have not been built, so
+    templates can fall back to a render-blocking stylesheet.
+    """
+    path = finders.find(f"dist/critical/{layout}.css")
+    return mark_safe(Path(path).read_text()) if path else ""
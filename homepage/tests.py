@@ -1,3 +1,247 @@
-from django.test import TestCase
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.templatetags.static import static
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from syafiqkaydotcom.cache import (
+    cache_public_page,
+    clear_page_cache,
+    page_cache_key,
+    template_etag,
+)
+from syafiqkaydotcom.db.locks import LockTimeout, advisory_lock
+from syafiqkaydotcom.db.router import PIN_COOKIE_NAME
+from syafiqkaydotcom.preload import static_origin
+
+RELEASE = "homepage.management.commands.release"
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+class PageCacheTest(TestCase):
+    def setUp(self):
+        clear_page_cache()
+        self.addCleanup(clear_page_cache)
+
+    def test_second_anonymous_request_skips_the_template_engine(self):
+        first = self.client.get(reverse("homepage:homepage"))
+        self.assertTemplateUsed(first, "homepage/base.html")
+        second = self.client.get(reverse("homepage:homepage"))
+        self.assertEqual(second.templates, [])
+        self.assertEqual(second.content, first.content)
+
+    def test_template_views_are_cached_after_rendering(self):
+        self.client.get(reverse("taskmanager:help"))
+        response = self.client.get(reverse("taskmanager:help"))
+        self.assertEqual(response.templates, [])
+        self.assertContains(response, "What is a task manager?")
+
+    def test_requests_with_a_session_bypass_the_cache(self):
+        self.client.get(reverse("homepage:homepage"))
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = "abc"
+        response = self.client.get(reverse("homepage:homepage"))
+        self.assertTemplateUsed(response, "homepage/base.html")
+
+    def test_requests_pinned_to_the_primary_bypass_the_cache(self):
+        self.client.get(reverse("homepage:homepage"))
+        self.client.cookies[PIN_COOKIE_NAME] = "1"
+        response = self.client.get(reverse("homepage:homepage"))
+        self.assertTemplateUsed(response, "homepage/base.html")
+
+    async def test_async_views_are_cached(self):
+        calls = []
+
+        @cache_public_page()
+        async def view(request):
+            calls.append(request)
+            return HttpResponse("async")
+
+        for _ in range(2):
+            response = await view(RequestFactory().get("/async/"))
+        self.assertEqual(response.content, b"async")
+        self.assertEqual(len(calls), 1)
+
+    @override_settings(PAGE_CACHE_VARY_HEADERS=["Accept-Language"])
+    def test_key_varies_only_on_configured_headers(self):
+        factory = RequestFactory()
+        english = factory.get("/", HTTP_ACCEPT_LANGUAGE="en", HTTP_USER_AGENT="a")
+        other_agent = factory.get("/", HTTP_ACCEPT_LANGUAGE="en", HTTP_USER_AGENT="b")
+        japanese = factory.get("/", HTTP_ACCEPT_LANGUAGE="ja")
+        self.assertEqual(page_cache_key(english), page_cache_key(other_agent))
+        self.assertNotEqual(page_cache_key(english), page_cache_key(japanese))
+
+
+class ConditionalPageTest(TestCase):
+    def test_matching_etag_returns_not_modified(self):
+        for url in (reverse("homepage:homepage"), reverse("taskmanager:help")):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                etag = response["ETag"]
+                self.assertEqual(etag, f'"{template_etag(None)}"')
+                repeat = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(repeat.status_code, 304)
+                self.assertEqual(repeat.content, b"")
+
+    def test_etag_changes_with_build_version(self):
+        before = template_etag(None)
+        with override_settings(BUILD_VERSION="next"):
+            self.assertNotEqual(template_etag(None), before)
+
+    def test_etag_changes_with_built_assets(self):
+        before = template_etag(None)
+        storage = mock.Mock(hashed_files={"dist/site.css": "dist/site.0123.css"})
+        with (
+            mock.patch("syafiqkaydotcom.cache.staticfiles_storage", storage),
+            mock.patch("syafiqkaydotcom.cache._asset_digest", None),
+        ):
+            self.assertNotEqual(template_etag(None), before)
+        with tempfile.TemporaryDirectory() as base_dir:
+            Path(base_dir, "static/dist/critical").mkdir(parents=True)
+            Path(base_dir, "static/dist/critical/homepage.css").write_text("a{}")
+            with (
+                override_settings(BASE_DIR=Path(base_dir)),
+                mock.patch("syafiqkaydotcom.cache._asset_digest", None),
+            ):
+                self.assertNotEqual(template_etag(None), before)
+
+
+class FragmentCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.cache = caches["template_fragments"]
+        self.cache.clear()
+
+    def test_footer_fragment_is_keyed_on_the_year(self):
+        this_year = str(timezone.now().year)
+        self.assertIn(f"&copy; {this_year}", render_to_string("homepage/_footer.html"))
+        key = make_template_fragment_key("homepage_footer", [this_year])
+        self.assertIn(f"&copy; {this_year}", self.cache.get(key))
+
+    def test_partials_are_served_from_the_fragment_cache(self):
+        for name, fragment in [
+            ("homepage/_header.html", "homepage_header"),
+            ("_script.html", "script_tags"),
+        ]:
+            with self.subTest(name=name):
+                render_to_string(name)
+                self.cache.set(make_template_fragment_key(fragment), "cached")
+                self.assertEqual(render_to_string(name).strip(), "cached")
+
+    def test_css_fragment_is_keyed_on_the_layout(self):
+        context = {"layout": "homepage"}
+        render_to_string("_css.html", context)
+        self.cache.set(make_template_fragment_key("css_tags", ["homepage"]), "cached")
+        self.assertEqual(render_to_string("_css.html", context).strip(), "cached")
+        self.assertNotEqual(
+            render_to_string("_css.html", {"layout": "taskmanager"}).strip(), "cached"
+        )
+
+
+@mock.patch.dict("syafiqkaydotcom.preload._preload_headers", clear=True)
+class PreloadLinkTest(TestCase):
+    @override_settings(
+        STATIC_URL="https://cdn.example.com/static/",
+        STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    )
+    def test_layout_pages_preload_their_assets(self):
+        response = self.client.get(reverse("taskmanager:help"))
+        links = response["Link"].split(", ")
+        self.assertEqual(links[0], f"<{static_origin()}>; rel=preconnect")
+        self.assertIn(f"<{static('dist/site.css')}>; rel=preload; as=style", links)
+        self.assertIn(f"<{static('dist/site.js')}>; rel=preload; as=script", links)
+
+    def test_only_html_pages_of_a_layout_get_the_header(self):
+        suggest = self.client.get(reverse("taskmanager:suggest"), {"q": "a"})
+        admin_login = self.client.get(reverse("admin:login"))
+        self.assertNotIn("Link", suggest)
+        self.assertNotIn("Link", admin_login)
+
+    @override_settings(
+        STATIC_URL="/static/",
+        STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage",
+    )
+    def test_relative_static_url_skips_preconnect(self):
+        response = self.client.get(reverse("homepage:homepage"))
+        self.assertEqual(
+            response["Link"],
+            "</static/dist/site.css>; rel=preload; as=style, "
+            "</static/dist/site.js>; rel=preload; as=script",
+        )
+
+
+class ReleaseCommandTest(TestCase):
+    def test_lock_is_exclusive(self):
+        with advisory_lock("test-lock"):
+            with self.assertRaises(LockTimeout):
+                with advisory_lock("test-lock", timeout=0):
+                    pass
+            with advisory_lock("other-lock", timeout=0):
+                pass
+        with advisory_lock("test-lock", timeout=0):
+            pass
+
+    def test_migrated_database_is_left_alone(self):
+        stdout = StringIO()
+        with mock.patch(f"{RELEASE}.call_command", wraps=call_command) as calls:
+            call_command("release", skip_static=True, stdout=stdout)
+        self.assertEqual(stdout.getvalue().strip(), "No migrations to apply.")
+        self.assertNotIn("migrate", [call.args[0] for call in calls.call_args_list])
+
+    def test_rechecks_after_waiting_for_the_lock(self):
+        stdout = StringIO()
+        with mock.patch(f"{RELEASE}.pending_migrations", side_effect=[["0002"], []]):
+            call_command("release", skip_static=True, stdout=stdout)
+        self.assertIn("applied by another release", stdout.getvalue())
+
+
+class PrerenderCommandTest(TestCase):
+    def test_writes_public_pages_to_output_directory(self):
+        with tempfile.TemporaryDirectory() as output:
+            call_command("prerender", output=output, stdout=StringIO())
+            homepage = Path(output, "index.html").read_text()
+            help_page = Path(output, "taskmanager/help/index.html").read_text()
+        self.assertIn("<title>Welcome | syafiqkay.com</title>", homepage)
+        self.assertIn("What is a task manager?", help_page)
+
+    def test_uploads_pages_alongside_manifest_static_files(self):
+        caches["template_fragments"].clear()
+        self.addCleanup(caches["template_fragments"].clear)
+        with tempfile.TemporaryDirectory() as static_root:
+            # As collectstatic leaves it for the assets the pages link to.
+            Path(static_root, "staticfiles.json").write_text(
+                json.dumps(
+                    {
+                        "version": "1.1",
+                        "paths": {
+                            "dist/site.css": "dist/site.0123456789ab.css",
+                            "dist/site.js": "dist/site.0123456789ab.js",
+                        },
+                    }
+                )
+            )
+            storage = {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+                "OPTIONS": {"location": static_root, "base_url": "/static/"},
+            }
+            stdout = StringIO()
+            with override_settings(
+                STATIC_ROOT=static_root,
+                STATICFILES_STORAGE=(
+                    "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+                ),
+                PRERENDER_STORAGE=storage,
+            ):
+                call_command("prerender", stdout=stdout)
+            homepage = Path(static_root, "pages/index.html").read_text()
+        self.assertIn("/ -> /static/pages/index.html", stdout.getvalue())
+        self.assertIn("dist/site.0123456789ab.css", homepage)
@@ -1,4 +1,10 @@
 from django.shortcuts import render
+
+from syafiqkaydotcom.cache import cache_public_page, conditional_page
+
+
 # Render the homepage view
+@conditional_page
+@cache_public_page()
 def homepage(request):
-    return render(request, 'homepage/base.html')
\ No newline at end of file
+    return render(request, 'homepage/base.html')
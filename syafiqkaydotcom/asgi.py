@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'syafiqkaydotcom.settings')
 
 application = get_asgi_application()
+
+from .warmup import warm_on_boot  # noqa: E402  (needs settings configured)
+
+warm_on_boot()
@@ -0,0 +1,239 @@
+"""Build-time asset pipeline: vendor, subset, minify and bundle CSS/JS.
+
+Replaces the jsDelivr Bootstrap link and the separate jQuery/Bootstrap script
+tags with one stylesheet and one script under ``static/dist/``. The bundles
+are hashed like any other static file by the manifest storage.
+
+Each page layout also gets ``static/dist/critical/<layout>.css``: the rules its
+header and page shell need for the first paint, which ``_css.html`` inlines
+while the full stylesheet loads without blocking rendering.
+"""
+
+import base64
+import hashlib
+import re
+from pathlib import Path
+
+# Pinned third-party files, verified against their published SRI hashes.
+VENDOR_FILES = {
+    "bootstrap.min.css": (
+        "https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/css/bootstrap.min.css",
+        "sha384-rbsA2VBKQhggwzxH7pPCaAqO46MgnOM80zW1RWuH61DGLwZJEdK2Kadq2F9CUG65",
+    ),
+    "jquery.min.js": (
+        "https://code.jquery.com/jquery-3.7.1.min.js",
+        "sha256-/JqT3SQfawRcv/BIHPThkBvs0OEvtFFmqPF/lYI/Cxo=",
+    ),
+    "bootstrap.bundle.min.js": (
+        "https://cdn.jsdelivr.net/npm/bootstrap@5.2.3/dist/js/bootstrap.bundle.min.js",
+        "sha384-kenU1KFdBIe4zVF0s0G1M5b4hcpxyD9F7jL+jjXkk+Q2h455rYXK/7HAuoJl+0I4",
+    ),
+}
+CSS_SOURCES = ["bootstrap.min.css"]
+# Order matters: Bootstrap's jQuery integration needs jQuery loaded first.
+JS_SOURCES = ["jquery.min.js", "bootstrap.bundle.min.js"]
+
+# Layouts whose above-the-fold CSS is inlined, by base template.
+LAYOUTS = {
+    "homepage": "homepage/base.html",
+    "taskmanager": "taskmanager/base.html",
+}
+
+# Classes Bootstrap's JavaScript adds at runtime, so they never appear in
+# templates but must survive subsetting.
+RUNTIME_CLASSES = {
+    "active",
+    "collapse",
+    "collapsed",
+    "collapsing",
+    "disabled",
+    "fade",
+    "modal-backdrop",
+    "modal-open",
+    "show",
+    "showing",
+    "was-validated",
+}
+
+_CLASS_ATTR_RE = re.compile(r"""class\s*=\s*["']([^"']*)["']""")
+_TEMPLATE_TAG_RE = re.compile(r"{%.*?%}|{{.*?}}", re.DOTALL)
+_INCLUDE_RE = re.compile(r"""{%\s*include\s+["']([^"']+)["']""")
+_CONTENT_BLOCK_RE = re.compile(r"{%\s*block\s+content\s*%}")
+_SELECTOR_CLASS_RE = re.compile(r"\.(-?[_a-zA-Z][_a-zA-Z0-9-]*)")
+_NOT_RE = re.compile(r":not\([^()]*\)")
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_SOURCE_MAP_RE = re.compile(r"^//# sourceMappingURL=.*$", re.MULTILINE)
+
+
+class IntegrityError(Exception):
+    """A vendored file does not match its pinned SRI hash."""
+
+
+def check_integrity(data, integrity):
+    algorithm, expected = integrity.split("-", 1)
+    actual = base64.b64encode(hashlib.new(algorithm, data).digest()).decode()
+    if actual != expected:
+        raise IntegrityError(f"expected {integrity}, got {algorithm}-{actual}")
+
+
+def fetch_vendor_files(vendor_dir):
+    """Download any missing vendor file into ``vendor_dir`` and verify all."""
+    # Only build_assets downloads; workers import this module for LAYOUTS.
+    import urllib.request
+
+    vendor_dir = Path(vendor_dir)
+    vendor_dir.mkdir(parents=True, exist_ok=True)
+    for name, (url, integrity) in VENDOR_FILES.items():
+        path = vendor_dir / name
+        if not path.exists():
+            with urllib.request.urlopen(url, timeout=30) as response:
+                path.write_bytes(response.read())
+        try:
+            check_integrity(path.read_bytes(), integrity)
+        except IntegrityError as exc:
+            raise IntegrityError(f"{name}: {exc}") from None
+
+
+def _classes_in(source):
+    classes = set()
+    for value in _CLASS_ATTR_RE.findall(source):
+        classes.update(_TEMPLATE_TAG_RE.sub(" ", value).split())
+    return classes
+
+
+def used_classes(template_dirs):
+    """Collect every literal class name used in ``class="..."`` attributes.
+
+    Template tags inside attributes are dropped, so only static class names
+    count; dynamic ones belong in ``RUNTIME_CLASSES``.
+    """
+    classes = set(RUNTIME_CLASSES)
+    for directory in map(Path, template_dirs):
+        for path in directory.rglob("*.html"):
+            classes |= _classes_in(path.read_text())
+    return classes
+
+
+def _read_template(template_dirs, name):
+    for directory in map(Path, template_dirs):
+        if (directory / name).exists():
+            return (directory / name).read_text()
+    raise FileNotFoundError(f"Template {name} not found in {template_dirs}.")
+
+
+def above_the_fold_classes(template_dirs, layout):
+    """Collect the classes a layout renders before its ``content`` block.
+
+    That is the base template's own markup up to and including ``<main>``
+    and every partial it includes on the way, i.e. the page shell every page
+    of the layout paints first.
+    """
+    source = _CONTENT_BLOCK_RE.split(_read_template(template_dirs, layout))[0]
+    classes = set(RUNTIME_CLASSES) | _classes_in(source)
+    for name in _INCLUDE_RE.findall(source):
+        classes |= _classes_in(_read_template(template_dirs, name))
+    return classes
+
+
+def _split_blocks(css):
+    """Yield ``(prelude, body)`` for each top-level block in ``css``.
+
+    ``body`` is ``None`` for statements such as ``@charset ...;``.
+    """
+    depth, start, prelude_end, quote = 0, 0, None, None
+    for index, char in enumerate(css):
+        if quote:
+            if char == quote and css[index - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "{":
+            if depth == 0:
+                prelude_end = index
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                yield css[start:prelude_end].strip(), css[prelude_end + 1 : index]
+                start = index + 1
+        elif char == ";" and depth == 0:
+            yield css[start:index].strip(), None
+            start = index + 1
+
+
+def _selector_is_used(selector, classes):
+    required = _SELECTOR_CLASS_RE.findall(_NOT_RE.sub("", selector))
+    return all(name in classes for name in required)
+
+
+def subset_css(css, classes):
+    """Drop style rules whose selectors need a class outside ``classes``.
+
+    Grouped selectors are filtered individually; ``@media`` and ``@supports``
+    blocks are subset recursively and dropped when empty. Other at-rules
+    (``@keyframes``, ``@font-face``, ...) are kept whole.
+    """
+    css = _COMMENT_RE.sub("", css)
+    output = []
+    for prelude, body in _split_blocks(css):
+        if body is None:
+            output.append(f"{prelude};")
+        elif prelude.startswith(("@media", "@supports")):
+            inner = subset_css(body, classes)
+            if inner:
+                output.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith("@"):
+            output.append(f"{prelude}{{{body}}}")
+        else:
+            selectors = [
+                selector.strip()
+                for selector in prelude.split(",")
+                if _selector_is_used(selector, classes)
+            ]
+            if selectors:
+                output.append(f"{','.join(selectors)}{{{body}}}")
+    return "".join(output)
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from ``css``."""
+    css = _COMMENT_RE.sub("", css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def bundle_js(sources):
+    """Concatenate already-minified scripts, dropping source map comments."""
+    parts = [_SOURCE_MAP_RE.sub("", source).strip() for source in sources]
+    # A leading semicolon guards against a file that omits its final one.
+    return "".join(f";{part}\n" for part in parts)
+
+
+def build_bundles(vendor_dir, dist_dir, template_dirs):
+    """Write ``site.css``, ``site.js`` and each layout's critical CSS.
+
+    Returns:
+        dict: Output file name to ``(input_bytes, output_bytes)``.
+    """
+    vendor_dir, dist_dir = Path(vendor_dir), Path(dist_dir)
+    dist_dir.mkdir(parents=True, exist_ok=True)
+    classes = used_classes(template_dirs)
+    css = "".join((vendor_dir / name).read_text() for name in CSS_SOURCES)
+    js = [(vendor_dir / name).read_text() for name in JS_SOURCES]
+    outputs = {
+        "site.css": (len(css), minify_css(subset_css(css, classes))),
+        "site.js": (sum(map(len, js)), bundle_js(js)),
+    }
+    for layout, template in LAYOUTS.items():
+        critical = above_the_fold_classes(template_dirs, template)
+        outputs[f"critical/{layout}.css"] = (
+            len(css),
+            minify_css(subset_css(css, critical)),
+        )
+    sizes = {}
+    for name, (input_size, content) in outputs.items():
+        (dist_dir / name).parent.mkdir(parents=True, exist_ok=True)
+        (dist_dir / name).write_text(content)
+        sizes[name] = (input_size, len(content))
+    return sizes
@@ -0,0 +1,181 @@
+"""HTTP caching for pages that look the same to every anonymous visitor.
+
+``cache_public_page`` keeps rendered pages in a server-side cache, and
+``conditional_page`` lets browsers and crawlers revalidate with a 304.
+"""
+
+import hashlib
+import json
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from .db.router import PIN_COOKIE_NAME
+from .warmup import iter_template_files
+
+PAGE_CACHE_ALIAS = "pages"
+
+
+def page_cache_key(request):
+    """Build the cache key for ``request`` from host, path and vary headers.
+
+    Only the headers listed in ``PAGE_CACHE_VARY_HEADERS`` take part, so
+    unrelated headers (cookies, user agents) do not fragment the cache.
+    """
+    parts = [request.method, request.get_host(), request.get_full_path()]
+    parts += [
+        request.headers.get(header, "") for header in settings.PAGE_CACHE_VARY_HEADERS
+    ]
+    digest = hashlib.md5("\n".join(parts).encode(), usedforsecurity=False)
+    return f"page:{digest.hexdigest()}"
+
+
+def is_cacheable_request(request):
+    # A session cookie may mean a signed-in user whose page differs, and a
+    # client that just wrote must see its write, so those requests always
+    # reach the view.
+    return (
+        settings.PAGE_CACHE_ENABLED
+        and request.method in ("GET", "HEAD")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and PIN_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def is_cacheable_response(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and "private" not in response.get("Cache-Control", "")
+    )
+
+
+def cache_public_page(timeout=DEFAULT_TIMEOUT, cache_alias=PAGE_CACHE_ALIAS):
+    """Serve the decorated view's response from the page cache when possible.
+
+    Works on sync and async views alike.
+
+    Args:
+        timeout (int, optional): Seconds to keep a page. Defaults to the
+            cache's own ``TIMEOUT``.
+        cache_alias (str, optional): Entry in ``CACHES`` to store pages in.
+    """
+
+    def decorator(view):
+        def store(cache, key, response):
+            def set_if_cacheable(response):
+                if is_cacheable_response(response):
+                    cache.set(key, response, timeout)
+
+            if callable(getattr(response, "render", None)):
+                # TemplateResponse: cache once it has actually been rendered.
+                response.add_post_render_callback(set_if_cacheable)
+            else:
+                set_if_cacheable(response)
+
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if not is_cacheable_request(request):
+                    return await view(request, *args, **kwargs)
+                cache = caches[cache_alias]
+                key = page_cache_key(request)
+                response = await cache.aget(key)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                    store(cache, key, response)
+                return response
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_cacheable_request(request):
+                return view(request, *args, **kwargs)
+            cache = caches[cache_alias]
+            key = page_cache_key(request)
+            response = cache.get(key)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                store(cache, key, response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def clear_page_cache(cache_alias=PAGE_CACHE_ALIAS):
+    caches[cache_alias].clear()
+
+
+_template_set_digest = None
+
+
+def template_set_digest():
+    """Return a hash over the source of every project template.
+
+    Computed once per process, except under DEBUG where templates are edited
+    in place.
+    """
+    global _template_set_digest
+    if _template_set_digest is None or settings.DEBUG:
+        digest = hashlib.sha256()
+        for _, name, path in iter_template_files():
+            digest.update(name.encode())
+            digest.update(path.read_bytes())
+        _template_set_digest = digest.hexdigest()
+    return _template_set_digest
+
+
+_asset_digest = None
+
+
+def asset_digest():
+    """Return a hash over the built bundles and the static files manifest.
+
+    Pages inline ``dist/critical/*.css`` and link the hashed asset names, so
+    a deploy that only changes CSS or JS still changes the page. Computed
+    once per process, except under DEBUG.
+    """
+    global _asset_digest
+    if _asset_digest is None or settings.DEBUG:
+        digest = hashlib.sha256()
+        dist_dir = settings.BASE_DIR / "static" / "dist"
+        for path in sorted(dist_dir.rglob("*")):
+            if path.is_file():
+                digest.update(path.relative_to(dist_dir).as_posix().encode())
+                digest.update(path.read_bytes())
+        # Only manifest storages have hashed names.
+        hashed_files = getattr(staticfiles_storage, "hashed_files", {})
+        digest.update(json.dumps(hashed_files, sort_keys=True).encode())
+        _asset_digest = digest.hexdigest()
+    return _asset_digest
+
+
+def template_etag(request, *args, **kwargs):
+    """ETag for pages rendered purely from templates.
+
+    The page only changes when a template, the built assets or the deployed
+    build changes, or when the footer's ``{% now "Y" %}`` rolls over, so all
+    of them are hashed.
+    """
+    parts = [
+        template_set_digest(),
+        asset_digest(),
+        settings.BUILD_VERSION,
+        str(timezone.now().year),
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+# Answers If-None-Match with 304 before the view or page cache is consulted.
+conditional_page = condition(etag_func=template_etag)
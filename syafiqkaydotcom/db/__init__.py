@@ -0,0 +1,43 @@
+"""Database connection pooling for every backend the site runs on.
+
+``configure_pooling`` rewrites a ``DATABASES`` entry so that:
+
+* PostgreSQL uses ``syafiqkaydotcom.db.postgresql``, backed by psycopg 3's
+  ``psycopg_pool.ConnectionPool``;
+* SQL Server uses ``syafiqkaydotcom.db.mssql``, which keeps mssql-django's
+  pyodbc connections in ``pool.ConnectionPool``;
+* anything else (SQLite) keeps persistent connections via ``CONN_MAX_AGE``.
+
+Pooled backends return the connection to the pool at the end of each request
+(``CONN_MAX_AGE`` is 0) instead of closing it. Pools are per process and
+retire connections after ``max_lifetime`` seconds, or ``max_idle`` seconds
+unused. With ``CONN_HEALTH_CHECKS`` a connection is checked before it is
+handed out.
+"""
+
+POOLED_ENGINES = {
+    "django.db.backends.postgresql": "syafiqkaydotcom.db.postgresql",
+    "mssql": "syafiqkaydotcom.db.mssql",
+}
+
+
+def configure_pooling(database, pool_options=None, conn_max_age=600):
+    """Return a copy of ``database`` set up for pooled or persistent connections.
+
+    Args:
+        database (dict): One ``DATABASES`` entry.
+        pool_options (dict, optional): ``min_size``, ``max_size``,
+            ``max_lifetime``, ``max_idle`` and ``timeout`` for the pool. Pooling
+            is off when empty.
+        conn_max_age (int, optional): ``CONN_MAX_AGE`` for engines without a
+            pool. Defaults to 600 seconds.
+    """
+    database = {**database, "CONN_HEALTH_CHECKS": True}
+    engine = POOLED_ENGINES.get(database["ENGINE"])
+    if engine and pool_options:
+        database["ENGINE"] = engine
+        database["CONN_MAX_AGE"] = 0
+        database["OPTIONS"] = {**database.get("OPTIONS", {}), "pool": pool_options}
+    else:
+        database["CONN_MAX_AGE"] = conn_max_age
+    return database
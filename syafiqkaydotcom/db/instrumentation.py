@@ -0,0 +1,143 @@
+"""Per-request SQL accounting: query count, database time and repeated queries.
+
+``QueryInstrumentationMiddleware`` records every query a sampled request runs,
+on every database alias, and reports the totals in a ``Server-Timing`` header
+and one logfmt line on the ``syafiqkaydotcom.queries`` logger. A statement
+shape (the SQL with literals and ``IN`` lists collapsed) run more than
+``QUERY_REPEAT_THRESHOLD`` times is almost always an N+1 loop; it is logged as
+a warning, or raised as ``RepeatedQueryError`` when ``QUERY_REPEAT_RAISE``.
+"""
+
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("syafiqkaydotcom.queries")
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+
+
+class RepeatedQueryError(Exception):
+    """A request ran the same statement shape too many times."""
+
+
+def normalize_sql(sql):
+    """Reduce ``sql`` to its shape, e.g. ``WHERE id IN (%s, %s)`` -> ``IN (...)``."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _LIST_RE.sub("(...)", sql)
+
+
+class QueryStats:
+    """Callable for ``connection.execute_wrapper`` that tallies queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.shapes[normalize_sql(sql)] += 1
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.shapes.values())
+
+    def repeated(self, threshold):
+        """Return ``(shape, count)`` pairs run more than ``threshold`` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.duration * 1000:.1f};'
+            f'desc="{self.count} queries, {self.duplicates} duplicate"'
+        )
+
+
+class QueryInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def sampled():
+        rate = settings.QUERY_INSTRUMENTATION_SAMPLE_RATE
+        return rate >= 1 or random.random() < rate
+
+    @staticmethod
+    def instrument(stats):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        stats = request.query_stats = QueryStats()
+        with self.instrument(stats):
+            response = self.get_response(request)
+        self.report(request, response, stats)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        stats = request.query_stats = QueryStats()
+        # Connections belong to the thread that runs the request's sync code
+        # (sync_to_async), not to the event loop's, so wrap them there.
+        stack = await sync_to_async(self.instrument)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self.report(request, response, stats)
+        return response
+
+    def report(self, request, response, stats):
+        timing = stats.server_timing()
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "-"
+        logger.info(
+            "method=%s path=%s view=%s status=%s queries=%d db_ms=%.1f duplicates=%d",
+            request.method,
+            request.path,
+            view,
+            response.status_code,
+            stats.count,
+            stats.duration * 1000,
+            stats.duplicates,
+        )
+        repeated = stats.repeated(settings.QUERY_REPEAT_THRESHOLD)
+        if not repeated:
+            return
+        shape, count = repeated[0]
+        message = f"{view} ran the same query {count} times: {shape}"
+        if settings.QUERY_REPEAT_RAISE:
+            raise RepeatedQueryError(message)
+        logger.warning(message)
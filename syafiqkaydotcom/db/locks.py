@@ -0,0 +1,118 @@
+"""Cross-process locks held in the database, for one-off deploy steps."""
+
+import fcntl
+import hashlib
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+POLL_INTERVAL = 0.5
+
+
+class LockTimeout(Exception):
+    """The lock was still held elsewhere when the timeout ran out."""
+
+
+def _lock_key(name):
+    # pg_advisory_lock takes a signed 64-bit key.
+    digest = hashlib.sha256(name.encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+def _postgresql(connection, name):
+    key = _lock_key(name)
+
+    def acquire():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [key])
+            return cursor.fetchone()[0]
+
+    def release():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
+
+    return acquire, release
+
+
+def _microsoft(connection, name):
+    def acquire():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SET NOCOUNT ON; DECLARE @result int; "
+                "EXEC @result = sp_getapplock @Resource = %s, "
+                "@LockMode = 'Exclusive', @LockOwner = 'Session', @LockTimeout = 0; "
+                "SELECT @result",
+                [name],
+            )
+            return cursor.fetchone()[0] >= 0
+
+    def release():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "EXEC sp_releaseapplock @Resource = %s, @LockOwner = 'Session'",
+                [name],
+            )
+
+    return acquire, release
+
+
+def _sqlite(connection, name):
+    # SQLite has no lock service, but every process using the database file
+    # is on this host.
+    key = _lock_key(f"{connection.settings_dict['NAME']}|{name}")
+    path = Path(tempfile.gettempdir()) / f"sqlite-lock-{key & 0xFFFFFFFF:08x}"
+    handle = None
+
+    def acquire():
+        nonlocal handle
+        handle = handle or open(path, "a")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def release():
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+    return acquire, release
+
+
+LOCKS = {
+    "postgresql": _postgresql,
+    "microsoft": _microsoft,
+    "sqlite": _sqlite,
+}
+
+
+@contextmanager
+def advisory_lock(name, using=DEFAULT_DB_ALIAS, timeout=600):
+    """Hold the cluster-wide lock ``name`` for the duration of the block.
+
+    Uses PostgreSQL advisory locks, SQL Server application locks, or a lock
+    file next to a SQLite database. Session-level, so the block can run
+    several transactions (as ``migrate`` does) on the same connection.
+
+    Raises:
+        LockTimeout: If the lock is not acquired within ``timeout`` seconds.
+    """
+    connection = connections[using]
+    try:
+        acquire, release = LOCKS[connection.vendor](connection, name)
+    except KeyError:
+        raise NotImplementedError(
+            f"Advisory locks are not supported on {connection.vendor!r}."
+        ) from None
+    deadline = time.monotonic() + timeout
+    while not acquire():
+        if time.monotonic() >= deadline:
+            raise LockTimeout(f"Timed out after {timeout}s waiting for {name!r}.")
+        time.sleep(POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        release()
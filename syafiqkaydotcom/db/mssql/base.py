@@ -0,0 +1,67 @@
+"""mssql-django backend that keeps pyodbc connections in a process-wide pool.
+
+unixODBC's own pooling is off unless enabled in ``odbcinst.ini`` on the host,
+so the pool lives here. Connections are still made by mssql-django, with its
+retries, timeouts and encoding options.
+"""
+
+import functools
+import threading
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from mssql.base import DatabaseWrapper as BaseDatabaseWrapper
+
+from ..pool import ConnectionPool
+
+
+def check_connection(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1").fetchall()
+    finally:
+        cursor.close()
+
+
+class DatabaseWrapper(BaseDatabaseWrapper):
+    _connection_pools = {}
+    _pools_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        pool_options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+        key = (self.alias, self.settings_dict["NAME"])
+        with self._pools_lock:
+            if key not in self._connection_pools:
+                check = None
+                if self.settings_dict["CONN_HEALTH_CHECKS"]:
+                    check = check_connection
+                self._connection_pools[key] = ConnectionPool(
+                    check=check, **pool_options
+                )
+            return self._connection_pools[key]
+
+    @classmethod
+    def close_pools(cls):
+        """Close every pool, e.g. in a freshly forked worker."""
+        with cls._pools_lock:
+            pools, cls._connection_pools = cls._connection_pools, {}
+        for pool in pools.values():
+            pool.close()
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        # New connections are made by mssql-django, with this wrapper's
+        # parameters.
+        return pool.getconn(functools.partial(super().get_new_connection, conn_params))
+
+    def _close(self):
+        pool = self.pool
+        if self.connection is None or pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
+        self.connection = None
@@ -0,0 +1,144 @@
+"""A small thread-safe pool for DB-API connections (used for pyodbc)."""
+
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the pool's ``timeout``."""
+
+
+class ConnectionPool:
+    """Hand out and take back connections made by ``connect``.
+
+    Idle connections are reused most-recently-returned first, so a quiet
+    worker keeps a few warm connections and lets the rest age out. Mirrors the
+    parts of ``psycopg_pool.ConnectionPool`` the database wrappers use.
+
+    Args:
+        connect (callable, optional): Returns a new connection. May instead be
+            passed to each ``getconn`` call.
+        min_size (int, optional): Accepted for parity with psycopg's pool;
+            connections are opened on demand.
+        max_size (int, optional): Most connections open at once.
+        max_lifetime (float, optional): Seconds after which a connection is
+            closed instead of reused.
+        max_idle (float, optional): Seconds a connection may sit unused.
+        timeout (float, optional): Seconds ``getconn`` waits for a free slot.
+        check (callable, optional): Raises if a connection is unusable; run
+            before an idle connection is handed out.
+        clock (callable, optional): Monotonic time source, for tests.
+    """
+
+    def __init__(
+        self,
+        connect=None,
+        min_size=1,
+        max_size=10,
+        max_lifetime=1800.0,
+        max_idle=300.0,
+        timeout=10.0,
+        check=None,
+        clock=time.monotonic,
+    ):
+        self.connect = connect
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.check = check
+        self.clock = clock
+        self._idle = deque()  # (connection, returned_at, created_at)
+        self._created_at = {}  # id(connection) -> created_at, for checked-out ones
+        self._size = 0
+        self._condition = threading.Condition()
+
+    @property
+    def size(self):
+        return self._size
+
+    def getconn(self, connect=None):
+        deadline = self.clock() + self.timeout
+        while True:
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        raise PoolTimeout(
+                            f"No connection available within {self.timeout}s "
+                            f"({self.max_size} in use)."
+                        )
+                if self._idle:
+                    connection, returned_at, created_at = self._idle.pop()
+                else:
+                    self._size += 1
+                    connection = None
+
+            if connection is None:
+                return self._open(connect or self.connect)
+            now = self.clock()
+            if (
+                now - created_at >= self.max_lifetime
+                or now - returned_at >= self.max_idle
+                or not self._passes_check(connection)
+            ):
+                self._discard(connection)
+                continue
+            self._created_at[id(connection)] = created_at
+            return connection
+
+    def putconn(self, connection):
+        created_at = self._created_at.pop(id(connection), None)
+        if created_at is None:
+            # Checked out before the pool was replaced (see close_pools).
+            connection.close()
+            return
+        try:
+            connection.rollback()
+        except Exception:
+            self._discard(connection)
+            return
+        if self.clock() - created_at >= self.max_lifetime:
+            self._discard(connection)
+            return
+        with self._condition:
+            self._idle.append((connection, self.clock(), created_at))
+            self._condition.notify()
+
+    def close(self):
+        """Close every idle connection. Checked-out ones close when returned."""
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _, _ in idle:
+            self._discard(connection)
+
+    def _open(self, connect):
+        try:
+            connection = connect()
+        except Exception:
+            self._release_slot()
+            raise
+        self._created_at[id(connection)] = self.clock()
+        return connection
+
+    def _passes_check(self, connection):
+        if self.check is None:
+            return True
+        try:
+            self.check(connection)
+        except Exception:
+            return False
+        return True
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self._release_slot()
+
+    def _release_slot(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
@@ -0,0 +1,83 @@
+"""PostgreSQL backend that checks connections out of a ``psycopg_pool`` pool.
+
+Django 5.1 ships the same feature as ``OPTIONS["pool"]``; this backend
+provides it on 5.0 with the same option names.
+"""
+
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql.base import DatabaseWrapper as BaseDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel, is_psycopg3
+
+
+class DatabaseWrapper(BaseDatabaseWrapper):
+    _connection_pools = {}
+    _pools_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        pool_options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+        # Keyed on NAME as well, so the test runner's test database gets its
+        # own pool.
+        key = (self.alias, self.settings_dict["NAME"])
+        with self._pools_lock:
+            if key not in self._connection_pools:
+                self._connection_pools[key] = self._create_pool(pool_options)
+        return self._connection_pools[key]
+
+    def _create_pool(self, pool_options):
+        if not is_psycopg3:
+            raise ImproperlyConfigured("Connection pooling requires psycopg 3.")
+        from psycopg_pool import ConnectionPool
+
+        check = None
+        if self.settings_dict["CONN_HEALTH_CHECKS"]:
+            check = ConnectionPool.check_connection
+        return ConnectionPool(
+            kwargs=self.get_connection_params(),
+            open=False,
+            check=check,
+            name=self.alias,
+            **pool_options,
+        )
+
+    @classmethod
+    def close_pools(cls):
+        """Close every pool, e.g. in a freshly forked worker."""
+        with cls._pools_lock:
+            pools, cls._connection_pools = cls._connection_pools, {}
+        for pool in pools.values():
+            pool.close()
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        pool.open()
+        connection = pool.getconn()
+        # As in the base class, self.isolation_level must be set before
+        # autocommit is configured.
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        if isolation_level is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            self.isolation_level = IsolationLevel(isolation_level)
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        pool = self.pool
+        if self.connection is None or pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
+        self.connection = None
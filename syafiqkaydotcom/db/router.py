@@ -0,0 +1,176 @@
+"""Send reads to read replicas and everything else to the primary.
+
+Replicas are the ``DATABASES`` entries listed in ``REPLICA_DATABASES`` (from
+``DATABASE_REPLICA_URLS``). Only models of ``REPLICA_APPS`` are read from
+them. Reads stay on the primary when:
+
+* the request is pinned: it is not a GET/HEAD, the client wrote within the
+  last ``replica_pin_seconds()``, or the request has already written;
+* the primary is inside ``transaction.atomic()``;
+* no replica has been measured within ``REPLICA_MAX_LAG`` seconds of the
+  primary.
+"""
+
+import contextvars
+import logging
+import math
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE_NAME = "db_primary"
+
+# Seconds the replica is behind the primary. NULL means "not a replica" or
+# "nothing to replay", both of which count as caught up.
+LAG_SQL = {
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+        "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) "
+        "END"
+    ),
+    "microsoft": (
+        "SELECT MAX(secondary_lag_seconds) "
+        "FROM sys.dm_hadr_database_replica_states WHERE is_local = 1"
+    ),
+}
+
+_pinned = contextvars.ContextVar("db_primary_pinned", default=False)
+_wrote = contextvars.ContextVar("db_primary_wrote", default=False)
+
+
+def pin_to_primary():
+    """Read from the primary for the rest of the current request or task."""
+    _pinned.set(True)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def replica_pin_seconds():
+    """How long a client reads from the primary after writing.
+
+    Long enough for any replica still in use to have caught up: lag is at
+    most ``REPLICA_MAX_LAG`` when measured and can grow until the next check.
+    """
+    return math.ceil(settings.REPLICA_MAX_LAG + settings.REPLICA_LAG_CHECK_INTERVAL)
+
+
+class ReplicaLagMonitor:
+    """Measure replica lag at most every ``REPLICA_LAG_CHECK_INTERVAL`` seconds.
+
+    Measurements are shared by every thread in the process. A replica that
+    has not been measured yet, or cannot be reached, counts as infinitely
+    behind until a check says otherwise.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._lag = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    def lag(self, alias):
+        now = self.clock()
+        with self._lock:
+            stale = now - self._checked_at.get(alias, -math.inf)
+            if stale < settings.REPLICA_LAG_CHECK_INTERVAL:
+                return self._lag[alias]
+            # Other threads keep using the old value while this one measures,
+            # so they read from the primary until the first measurement lands.
+            self._checked_at[alias] = now
+            self._lag.setdefault(alias, math.inf)
+        lag = self.measure(alias)
+        with self._lock:
+            self._lag[alias] = lag
+        return lag
+
+    def measure(self, alias):
+        connection = connections[alias]
+        sql = LAG_SQL.get(connection.vendor)
+        if sql is None:
+            return 0.0
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql)
+                (lag,) = cursor.fetchone()
+        except DatabaseError:
+            logger.warning("Replica %s is unreachable.", alias, exc_info=True)
+            return math.inf
+        return float(lag or 0)
+
+    def reset(self):
+        with self._lock:
+            self._lag.clear()
+            self._checked_at.clear()
+
+
+lag_monitor = ReplicaLagMonitor()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in settings.REPLICA_APPS:
+            return None
+        if is_pinned() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        fresh = [
+            alias
+            for alias in settings.REPLICA_DATABASES
+            if lag_monitor.lag(alias) <= settings.REPLICA_MAX_LAG
+        ]
+        return random.choice(fresh) if fresh else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in settings.REPLICA_APPS:
+            return None
+        # Later reads in this request, and this client's next requests, must
+        # see the write.
+        pin_to_primary()
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the primary's schema through replication.
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware(MiddlewareMixin):
+    """Pin writing requests, and the same client's next requests, to the primary.
+
+    The pin is carried by a short-lived cookie, so it follows the client
+    across workers without any shared state.
+    """
+
+    def process_request(self, request):
+        writing = request.method not in ("GET", "HEAD")
+        _pinned.set(writing or PIN_COOKIE_NAME in request.COOKIES)
+        _wrote.set(writing)
+
+    def process_response(self, request, response):
+        if _wrote.get() and settings.REPLICA_DATABASES:
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                "1",
+                max_age=replica_pin_seconds(),
+                httponly=True,
+                samesite="Lax",
+            )
+        # Worker threads are reused; do not leak the pin into the next request.
+        _pinned.set(False)
+        _wrote.set(False)
+        return response
@@ -0,0 +1,296 @@
+"""Request metrics in the Prometheus text format.
+
+``MetricsMiddleware`` records, per route (the URL name):
+
+* ``http_request_duration_seconds``: a fixed-bucket latency histogram;
+* ``http_requests_total``: requests by status code;
+* ``http_db_duration_seconds_total`` and ``http_db_queries_total``: database
+  time and queries of the requests sampled by
+  ``syafiqkaydotcom.db.instrumentation``, counted in
+  ``http_db_instrumented_requests_total``.
+
+Every value is a counter (histogram buckets are stored cumulatively), so
+worker processes merge by addition. With ``METRICS_DIR`` set, each process
+writes its counters to ``<METRICS_DIR>/<pid>.json`` at most every
+``METRICS_FLUSH_INTERVAL`` seconds and ``/metrics`` sums all the files. Files
+left by exited workers are folded into ``exited.json`` so their counts are
+kept. Without ``METRICS_DIR`` each process only reports itself.
+"""
+
+import atexit
+import fcntl
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+FAMILIES = {
+    "http_request_duration_seconds": ("histogram", "Request latency by route."),
+    "http_requests_total": ("counter", "Requests by route and status code."),
+    "http_db_duration_seconds_total": (
+        "counter",
+        "Database time of instrumented requests by route.",
+    ),
+    "http_db_queries_total": ("counter", "Queries of instrumented requests by route."),
+    "http_db_instrumented_requests_total": (
+        "counter",
+        "Requests whose database time was measured, by route.",
+    ),
+}
+
+logger = logging.getLogger(__name__)
+
+EXITED_FILE = "exited.json"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _family(name):
+    for suffix in ("_bucket", "_sum", "_count"):
+        if name.endswith(suffix) and name[: -len(suffix)] in FAMILIES:
+            return name[: -len(suffix)]
+    return name
+
+
+def _sort_key(sample):
+    name, labels = sample
+    le = dict(labels).get("le")
+    return (
+        _family(name),
+        [value for key, value in labels if key != "le"],
+        name,
+        math.inf if le == "+Inf" else float(le or 0),
+    )
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    """Counters keyed by ``(sample name, ((label, value), ...))``."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.values = defaultdict(int)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushed_at = -math.inf
+
+    def inc(self, name, labels, amount=1):
+        with self._lock:
+            self.values[(name, tuple(sorted(labels.items())))] += amount
+
+    def observe_request(self, route, status, duration, query_stats=None):
+        labels = {"route": route}
+        with self._lock:
+            values = self.values
+            for le in LATENCY_BUCKETS:
+                if duration <= le:
+                    values[_key("http_request_duration_seconds_bucket", route, le)] += 1
+            values[_key("http_request_duration_seconds_bucket", route, "+Inf")] += 1
+            values[_key("http_request_duration_seconds_sum", route)] += duration
+            values[_key("http_request_duration_seconds_count", route)] += 1
+            values[_key("http_requests_total", route, status=str(status))] += 1
+        if query_stats is not None:
+            self.inc("http_db_duration_seconds_total", labels, query_stats.duration)
+            self.inc("http_db_queries_total", labels, query_stats.count)
+            self.inc("http_db_instrumented_requests_total", labels)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.values)
+
+    def flush(self, directory, force=False):
+        """Write this process's counters to ``directory``, throttled.
+
+        One thread flushes at a time; unforced flushes skip while another is
+        in progress. Write errors are logged rather than raised, so metrics
+        never fail the request that triggered them.
+        """
+        if not self._flush_lock.acquire(blocking=force):
+            return
+        try:
+            now = self.clock()
+            if not force and now - self._flushed_at < settings.METRICS_FLUSH_INTERVAL:
+                return
+            self._flushed_at = now
+            _write(Path(directory) / f"{os.getpid()}.json", self.snapshot())
+        except OSError:
+            logger.warning("Could not write metrics to %s.", directory, exc_info=True)
+        finally:
+            self._flush_lock.release()
+
+
+def _key(name, route, le=None, **labels):
+    labels["route"] = route
+    if le is not None:
+        labels["le"] = le if isinstance(le, str) else repr(float(le))
+    return (name, tuple(sorted(labels.items())))
+
+
+def _write(path, values):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = [[name, list(labels), value] for (name, labels), value in values.items()]
+    # A unique temporary file per write, so concurrent writers never replace
+    # each other's half-written file; collect() only reads *.json.
+    fd, temporary = tempfile.mkstemp(
+        dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(json.dumps(data))
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+
+def _read(path):
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return {
+        (name, tuple(tuple(pair) for pair in labels)): value
+        for name, labels, value in data
+    }
+
+
+def _merge(into, values):
+    for key, value in values.items():
+        into[key] = into.get(key, 0) + value
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect(directory):
+    """Sum the counters of every process that has written to ``directory``."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    totals = {}
+    with open(directory / ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        exited = _read(directory / EXITED_FILE)
+        folded = False
+        for path in directory.glob("*.json"):
+            if path.name == EXITED_FILE:
+                continue
+            values = _read(path)
+            if path.stem.isdigit() and not _is_running(int(path.stem)):
+                _merge(exited, values)
+                path.unlink()
+                folded = True
+            else:
+                _merge(totals, values)
+        if folded:
+            _write(directory / EXITED_FILE, exited)
+    _merge(totals, exited)
+    return totals
+
+
+def render(values):
+    """Format counters in the Prometheus text exposition format."""
+    lines = []
+    current = None
+    for name, labels in sorted(values, key=_sort_key):
+        family = _family(name)
+        if family != current:
+            kind, help_text = FAMILIES.get(family, ("untyped", family))
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            current = family
+        label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+        value = _format_value(values[(name, labels)])
+        lines.append(f"{name}{{{label_text}}} {value}" if labels else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+@atexit.register
+def _flush_on_exit():
+    if getattr(settings, "METRICS_DIR", None):
+        registry.flush(settings.METRICS_DIR, force=True)
+
+
+def route_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else "unmatched"
+
+
+class MetricsMiddleware:
+    """Time each request and record it in ``registry``. Keep first in MIDDLEWARE."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def record(request, response, duration):
+        registry.observe_request(
+            route_name(request),
+            response.status_code,
+            duration,
+            getattr(request, "query_stats", None),
+        )
+        if settings.METRICS_DIR:
+            registry.flush(settings.METRICS_DIR)
+
+
+def metrics_view(request):
+    """Serve all processes' metrics, behind ``METRICS_TOKEN`` when it is set."""
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponseForbidden()
+    if settings.METRICS_DIR:
+        registry.flush(settings.METRICS_DIR, force=True)
+        values = collect(settings.METRICS_DIR)
+    else:
+        values = registry.snapshot()
+    return HttpResponse(render(values), content_type=CONTENT_TYPE)
@@ -0,0 +1,166 @@
+"""Opt-in sampling profiler for individual production requests.
+
+``ProfilingMiddleware`` profiles a request when it is picked by
+``PROFILING_SAMPLE_RATE`` or carries an ``X-Profile`` header signed by
+``manage.py profile_token``. While the view runs, a background thread
+samples the request thread's Python stack every ``PROFILING_INTERVAL``
+seconds; no tracing hooks are installed, so the view runs at full speed.
+
+Profiles are saved as collapsed stacks (``frame;frame;frame count`` lines,
+as read by flamegraph.pl and speedscope) to ``PROFILING_STORAGE``: local
+disk by default, or blob storage. Uploads happen off the request thread.
+"""
+
+import logging
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+HEADER = "X-Profile"
+SIGNING_SALT = "syafiqkaydotcom.profiling"
+
+# One upload at a time, in order; profiling is rare enough not to queue up.
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profile-upload")
+
+
+def _create_storage():
+    config = settings.PROFILING_STORAGE
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+profile_storage = SimpleLazyObject(_create_storage)
+
+
+def make_token():
+    """Return a value for the ``X-Profile`` header, valid for
+    ``PROFILING_TOKEN_MAX_AGE`` seconds."""
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign("profile")
+
+
+def has_valid_token(request):
+    token = request.headers.get(HEADER)
+    if not token:
+        return False
+    try:
+        signing.TimestampSigner(salt=SIGNING_SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def _frame_label(code):
+    path = Path(code.co_filename)
+    for root in (settings.BASE_DIR, *map(Path, sys.path)):
+        if root != Path() and path.is_relative_to(root):
+            path = path.relative_to(root)
+            break
+    return f"{code.co_qualname} ({path}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """Count the distinct stacks of one thread, sampled on a timer."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                if code not in self._labels:
+                    self._labels[code] = _frame_label(code)
+                frames.append(self._labels[code])
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def sample_current_thread():
+    return StackSampler(threading.get_ident(), settings.PROFILING_INTERVAL)
+
+
+def save_profile(name, content):
+    try:
+        profile_storage.save(name, ContentFile(content.encode()))
+    except Exception:
+        logger.exception("Could not save profile %s.", name)
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def should_profile(request):
+        rate = settings.PROFILING_SAMPLE_RATE
+        return (rate > 0 and random.random() < rate) or has_valid_token(request)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.should_profile(request):
+            return self.get_response(request)
+        with sample_current_thread() as sampler:
+            response = self.get_response(request)
+        return self.finish(request, response, sampler)
+
+    async def __acall__(self, request):
+        if not self.should_profile(request):
+            return await self.get_response(request)
+        # Samples the event loop thread; sync code run through sync_to_async
+        # shows up as waiting.
+        with sample_current_thread() as sampler:
+            response = await self.get_response(request)
+        return self.finish(request, response, sampler)
+
+    @staticmethod
+    def finish(request, response, sampler):
+        match = getattr(request, "resolver_match", None)
+        route = match.view_name.replace(":", "-") if match else "unmatched"
+        now = timezone.now()
+        name = f"{now:%Y-%m-%d}/{route}-{now:%H%M%S%f}-{os.getpid()}.collapsed"
+        executor.submit(save_profile, name, sampler.collapsed())
+        timing = f'profile;desc="{name}"'
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+        return response
@@ -1,13 +1,15 @@
-# Load environment variables from .env before anything else
-from dotenv import load_dotenv # type: ignore
-load_dotenv()
-
 from pathlib import Path
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load environment variables from .env before anything else. Deployed
+# containers get theirs from the environment and skip python-dotenv entirely.
+if (BASE_DIR / '.env').exists():
+    from dotenv import load_dotenv # type: ignore
+    load_dotenv(BASE_DIR / '.env')
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
@@ -47,13 +49,17 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'homepage',
     'taskmanager',
-    'storages',  # For Azure Blob Storage
 ]
 
 MIDDLEWARE = [
+    'syafiqkaydotcom.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'syafiqkaydotcom.db.instrumentation.QueryInstrumentationMiddleware',
+    'syafiqkaydotcom.profiling.ProfilingMiddleware',
+    'syafiqkaydotcom.db.router.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'syafiqkaydotcom.preload.PreloadLinkMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -82,11 +88,19 @@ WSGI_APPLICATION = 'syafiqkaydotcom.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-import dj_database_url # type: ignore
+from syafiqkaydotcom.db import configure_pooling
+
+
+def parse_database_url(url):
+    # Imported only when a URL is configured.
+    import dj_database_url # type: ignore
+    return dj_database_url.parse(url)
+
+
 database_url = os.environ.get("DATABASE_URL")
 if database_url:
     DATABASES = {
-        'default': dj_database_url.parse(database_url, conn_max_age=600)
+        'default': parse_database_url(database_url)
     }
 elif all(var in os.environ for var in [
     'DB_NAME', 'DB_USER', 'DB_PASSWORD', 'DB_HOST'
@@ -110,6 +124,147 @@ else:
         }
     }
 
+# Connection pooling for PostgreSQL and SQL Server, persistent connections
+# otherwise (see syafiqkaydotcom/db/). Sizes are per worker process; set
+# DB_POOL_MAX_SIZE=0 to turn pooling off.
+DB_POOL_OPTIONS = {
+    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 1)),
+    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+    'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800)),
+    'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+}
+# 'wsgi' (gunicorn gthread workers) or 'asgi' (uvicorn workers), see
+# gunicorn.conf.py. Under ASGI each request runs its sync code on a thread of
+# its own, so persistent connections would be left behind with every thread.
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi')
+DB_CONN_MAX_AGE = int(
+    os.environ.get('DB_CONN_MAX_AGE', 0 if SERVER_MODE == 'asgi' else 600)
+)
+
+
+def pooled(database):
+    pool_options = DB_POOL_OPTIONS if DB_POOL_OPTIONS['max_size'] else None
+    return configure_pooling(database, pool_options, conn_max_age=DB_CONN_MAX_AGE)
+
+
+DATABASES['default'] = pooled(DATABASES['default'])
+
+# Read replicas: comma-separated database URLs. Reads of REPLICA_APPS models go
+# to a replica less than REPLICA_MAX_LAG seconds behind the primary; writes and
+# reads right after a write go to the primary (see syafiqkaydotcom/db/router.py).
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',')
+    if url.strip()
+]
+REPLICA_DATABASES = [f'replica{index}' for index in range(len(DATABASE_REPLICA_URLS))]
+for alias, replica_url in zip(REPLICA_DATABASES, DATABASE_REPLICA_URLS):
+    DATABASES[alias] = {
+        **pooled(parse_database_url(replica_url)),
+        'TEST': {'MIRROR': 'default'},
+    }
+REPLICA_APPS = ['taskmanager']
+REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 5))
+REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', 5))
+DATABASE_ROUTERS = ['syafiqkaydotcom.db.router.ReplicaRouter']
+
+# Per-request query counts and DB time in Server-Timing and the logs (see
+# syafiqkaydotcom/db/instrumentation.py). A statement shape run more than
+# QUERY_REPEAT_THRESHOLD times in one request is reported as an N+1, and
+# raised rather than logged during development.
+QUERY_INSTRUMENTATION_SAMPLE_RATE = float(
+    os.environ.get('QUERY_INSTRUMENTATION_SAMPLE_RATE', 1.0)
+)
+QUERY_REPEAT_THRESHOLD = int(os.environ.get('QUERY_REPEAT_THRESHOLD', 10))
+QUERY_REPEAT_RAISE = DEBUG
+
+# Prometheus metrics at /metrics (see syafiqkaydotcom/metrics.py). Set
+# METRICS_DIR to a directory shared by all worker processes to report them
+# together; METRICS_TOKEN to require "Authorization: Bearer <token>".
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Sampling profiler (see syafiqkaydotcom/profiling.py). Off unless a request
+# is sampled or sends an X-Profile header from `manage.py profile_token`.
+# Profiles go to PROFILING_DIR, or to the PROFILING_AZURE_CONTAINER blob
+# container when that is set.
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+PROFILING_INTERVAL = float(os.environ.get('PROFILING_INTERVAL', 0.005))
+PROFILING_TOKEN_MAX_AGE = int(os.environ.get('PROFILING_TOKEN_MAX_AGE', 3600))
+PROFILING_DIR = os.environ.get('PROFILING_DIR', '/tmp/syafiqkaydotcom-profiles')
+if os.environ.get('PROFILING_AZURE_CONTAINER'):
+    PROFILING_STORAGE = {
+        'BACKEND': 'storages.backends.azure_storage.AzureStorage',
+        'OPTIONS': {'azure_container': os.environ['PROFILING_AZURE_CONTAINER']},
+    }
+else:
+    PROFILING_STORAGE = {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        'OPTIONS': {'location': PROFILING_DIR},
+    }
+
+# Live task updates over Server-Sent Events (taskmanager/events.py). With
+# PostgreSQL every worker hears every write through LISTEN/NOTIFY; otherwise
+# a tab only hears about writes made by the worker it is connected to.
+if DATABASES['default']['ENGINE'].endswith('postgresql'):
+    TASK_EVENTS_BROKER = {
+        'BACKEND': 'taskmanager.events.PostgresBroker',
+        'OPTIONS': {'using': 'default'},
+    }
+else:
+    TASK_EVENTS_BROKER = {'BACKEND': 'taskmanager.events.InProcessBroker'}
+TASK_EVENTS_HEARTBEAT = float(os.environ.get('TASK_EVENTS_HEARTBEAT', 15))
+
+# Caching
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Identifies the deployed build; changing it on deploy invalidates cached pages.
+# Docker images record theirs in a BUILD_VERSION file (see the Dockerfile).
+BUILD_VERSION_FILE = BASE_DIR / 'BUILD_VERSION'
+BUILD_VERSION = os.environ.get("BUILD_VERSION") or (
+    BUILD_VERSION_FILE.read_text().strip() if BUILD_VERSION_FILE.exists() else "dev"
+)
+
+PAGE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('PAGE_CACHE_DIR', '/tmp/syafiqkaydotcom-pages'),
+    },
+    # Works with any Redis-protocol server (Azure Cache for Redis, Valkey, ...).
+    # Requires the ``redis`` package.
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/1'),
+    },
+}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pages': {
+        **PAGE_CACHE_BACKENDS[os.environ.get('PAGE_CACHE_BACKEND', 'locmem')],
+        'TIMEOUT': int(os.environ.get('PAGE_CACHE_TIMEOUT', 600)),
+        'KEY_PREFIX': f'pages-{BUILD_VERSION}',
+    },
+    # Used by {% cache %} for static partials. Kept in-process: a network
+    # round-trip would cost more than rendering the fragment.
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template_fragments',
+        'KEY_PREFIX': f'fragments-{BUILD_VERSION}',
+    },
+}
+
+# Full-page caching of anonymous pages (see syafiqkaydotcom/cache.py). Off in
+# development so template edits show up immediately.
+PAGE_CACHE_ENABLED = not DEBUG
+PAGE_CACHE_VARY_HEADERS = []
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -144,11 +299,27 @@ USE_TZ = True
 AZURE_ACCOUNT_NAME = os.environ.get("AZURE_ACCOUNT_NAME")
 AZURE_ACCOUNT_KEY = os.environ.get("AZURE_ACCOUNT_KEY")
 AZURE_CONTAINER = os.environ.get("AZURE_CONTAINER", "static")
-STATIC_LOCATION = AZURE_CONTAINER
-STATIC_URL = f"https://{AZURE_ACCOUNT_NAME}.blob.core.windows.net/{STATIC_LOCATION}/"
-STATICFILES_STORAGE = "storages.backends.azure_storage.AzureStorage"
-AZURE_CUSTOM_DOMAIN = f"{AZURE_ACCOUNT_NAME}.blob.core.windows.net"
-AZURE_SSL = True
+if AZURE_ACCOUNT_NAME:
+    # django-storages and the Azure SDK (a third of a second to import) are
+    # only loaded when static files actually live on Azure.
+    INSTALLED_APPS.append('storages')
+    STATIC_LOCATION = AZURE_CONTAINER
+    STATIC_URL = f"https://{AZURE_ACCOUNT_NAME}.blob.core.windows.net/{STATIC_LOCATION}/"
+    STATICFILES_STORAGE = "storages.backends.azure_storage.AzureStorage"
+    AZURE_CUSTOM_DOMAIN = f"{AZURE_ACCOUNT_NAME}.blob.core.windows.net"
+    AZURE_SSL = True
+    # `manage.py prerender` uploads pages next to the static files, without
+    # the manifest lookups of STATICFILES_STORAGE.
+    PRERENDER_STORAGE = {'BACKEND': 'syafiqkaydotcom.storage.PageStorage'}
+else:
+    # Local development: runserver serves STATICFILES_DIRS itself.
+    STATIC_URL = '/static/'
+    STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    STATIC_ROOT = BASE_DIR / 'staticfiles'
+    PRERENDER_STORAGE = {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        'OPTIONS': {'location': STATIC_ROOT, 'base_url': STATIC_URL},
+    }
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
 # Default primary key field type
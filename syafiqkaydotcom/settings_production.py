@@ -0,0 +1,59 @@
+"""
+Production settings for syafiqkaydotcom project.
+
+Select with ``DJANGO_SETTINGS_MODULE=syafiqkaydotcom.settings_production``.
+Everything not overridden here comes from ``settings.py``.
+"""
+
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import AZURE_ACCOUNT_NAME, TEMPLATES
+
+DEBUG = False
+
+# Pin the cached loader explicitly (APP_DIRS cannot be combined with
+# ``loaders``) and turn off template debug info, which DEBUG would otherwise
+# enable. Templates are parsed once per process, never re-checked on disk.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'debug': False,
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+# Compile every project template when the WSGI/ASGI application loads, so
+# the first request a worker serves does not pay for parsing.
+WARM_TEMPLATES_ON_BOOT = True
+
+# Serve anonymous pages from the page cache.
+PAGE_CACHE_ENABLED = True
+
+# Content-hashed static file names, cached by browsers and CDNs for a year,
+# with gzip/brotli variants uploaded alongside. Without an Azure account the
+# hashed files are collected into STATIC_ROOT instead.
+if AZURE_ACCOUNT_NAME:
+    STATICFILES_STORAGE = "syafiqkaydotcom.storage.StaticManifestStorage"
+else:
+    STATICFILES_STORAGE = (
+        "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+    )
+
+# Instrument a sample of requests, and only log repeated queries.
+QUERY_INSTRUMENTATION_SAMPLE_RATE = float(
+    os.environ.get('QUERY_INSTRUMENTATION_SAMPLE_RATE', 0.05)
+)
+QUERY_REPEAT_RAISE = False
+
+# Let /metrics sum the counters of every gunicorn worker.
+METRICS_DIR = os.environ.get('METRICS_DIR', '/tmp/syafiqkaydotcom-metrics')
@@ -0,0 +1,85 @@
+"""Static file storage for production: hashed names, long-lived caching and
+pre-compressed variants on Azure Blob Storage."""
+
+import gzip
+import re
+from pathlib import PurePosixPath
+
+from django.contrib.staticfiles.storage import ManifestFilesMixin
+from django.core.files.base import ContentFile
+from storages.backends.azure_storage import AzureStorage
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip variants are uploaded.
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Pre-rendered pages keep their names across deploys, so caches must recheck.
+PAGE_CACHE_CONTROL = "public, max-age=300"
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".map", ".svg", ".json", ".txt", ".html"}
+
+# HashedFilesMixin inserts a 12 character md5 prefix before the extension.
+_HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.")
+
+
+def is_hashed_name(name):
+    return bool(_HASHED_NAME_RE.search(PurePosixPath(name).name))
+
+
+def compressors():
+    """Return ``(suffix, compress)`` pairs for the available encodings."""
+    available = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        available.append((".br", lambda data: brotli.compress(data, quality=11)))
+    return available
+
+
+class PrecompressedMixin:
+    """Save ``.gz`` and ``.br`` siblings next to every hashed text asset.
+
+    Blob storage does no content negotiation, so the CDN in front of it picks
+    the variant from ``Accept-Encoding``. The variants' ``Content-Encoding``
+    and ``Content-Type`` follow from their names (see ``mimetypes``).
+    """
+
+    def _save(self, name, content):
+        saved_name = super()._save(name, content)
+        is_compressible = PurePosixPath(name).suffix in COMPRESSIBLE_EXTENSIONS
+        if is_hashed_name(name) and is_compressible:
+            content.seek(0)
+            data = content.read()
+            for suffix, compress in compressors():
+                compressed = compress(data)
+                if len(compressed) < len(data):
+                    variant = f"{saved_name}{suffix}"
+                    if self.exists(variant):
+                        self.delete(variant)
+                    super()._save(variant, ContentFile(compressed))
+        return saved_name
+
+
+class StaticManifestStorage(PrecompressedMixin, ManifestFilesMixin, AzureStorage):
+    """AzureStorage that serves content-hashed static files cached for a year.
+
+    Only hashed names are marked immutable; the unhashed copies and the
+    manifest itself keep the container's default caching.
+    """
+
+    def get_object_parameters(self, name):
+        params = super().get_object_parameters(name)
+        if is_hashed_name(name):
+            params.setdefault("cache_control", IMMUTABLE_CACHE_CONTROL)
+        return params
+
+
+class PageStorage(AzureStorage):
+    """AzureStorage for the HTML written by ``manage.py prerender``.
+
+    Pages are not in the static files manifest, and are only cached briefly.
+    """
+
+    def get_object_parameters(self, name):
+        params = super().get_object_parameters(name)
+        params.setdefault("cache_control", PAGE_CACHE_CONTROL)
+        return params
@@ -0,0 +1,104 @@
+import base64
+import hashlib
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase
+
+from syafiqkaydotcom.assets import (
+    JS_SOURCES,
+    IntegrityError,
+    above_the_fold_classes,
+    build_bundles,
+    bundle_js,
+    check_integrity,
+    minify_css,
+    subset_css,
+    used_classes,
+)
+
+
+class AssetPipelineTest(SimpleTestCase):
+    CSS = (
+        "/*! banner */:root{--bs-blue:#0d6efd}body{margin:0}"
+        ".btn,.card{padding:1rem}.unused{color:red}.navbar .unused{color:blue}"
+        ".btn:not(.unused){outline:0}"
+        "@media (min-width:992px){.navbar-expand-lg{display:flex}.unused{top:0}}"
+        "@media print{.unused{display:none}}"
+        '@font-face{font-family:"x{y}";src:url(a.woff)}'
+    )
+
+    def test_subset_keeps_only_rules_for_used_classes(self):
+        css = subset_css(self.CSS, {"btn", "navbar", "navbar-expand-lg"})
+        self.assertEqual(
+            css,
+            ":root{--bs-blue:#0d6efd}body{margin:0}.btn{padding:1rem}"
+            ".btn:not(.unused){outline:0}"
+            "@media (min-width:992px){.navbar-expand-lg{display:flex}}"
+            '@font-face{font-family:"x{y}";src:url(a.woff)}',
+        )
+
+    def test_used_classes_reads_static_class_attributes(self):
+        classes = used_classes([settings.BASE_DIR / "templates"])
+        self.assertLessEqual({"navbar", "col-md-4", "btn-outline-light"}, classes)
+        self.assertIn("show", classes)
+        self.assertFalse(any("{" in name or "%" in name for name in classes))
+
+    def test_minify_and_bundle(self):
+        self.assertEqual(
+            minify_css("a > b ,\n c {\n color: red;\n}\n"), "a>b,c{color: red}"
+        )
+        self.assertEqual(
+            bundle_js(["var a=1\n//# sourceMappingURL=a.map", "var b=2;"]),
+            ";var a=1\n;var b=2;\n",
+        )
+
+    def test_above_the_fold_classes_stop_at_the_content_block(self):
+        classes = above_the_fold_classes(
+            [settings.BASE_DIR / "templates"], "taskmanager/base.html"
+        )
+        # The header and <main> come before the content block; the footer
+        # and page bodies do not.
+        self.assertLessEqual({"d-flex", "form-control", "container"}, classes)
+        self.assertNotIn("col-md-4", classes)
+        self.assertNotIn("table", classes)
+
+    def test_build_bundles_writes_critical_css_per_layout(self):
+        css = ".d-flex{display:flex}.table{width:100%}body{margin:0}"
+        with tempfile.TemporaryDirectory() as vendor:
+            dist = Path(vendor, "dist")
+            Path(vendor, "bootstrap.min.css").write_text(css)
+            for name in JS_SOURCES:
+                Path(vendor, name).write_text("var a=1;")
+            build_bundles(vendor, dist, [settings.BASE_DIR / "templates"])
+            critical = Path(dist, "critical", "taskmanager.css").read_text()
+            site = Path(dist, "site.css").read_text()
+        self.assertEqual(critical, ".d-flex{display:flex}body{margin:0}")
+        self.assertEqual(site, css)
+
+    def test_css_is_inlined_once_built(self):
+        with mock.patch("homepage.templatetags.site_assets.finders.find") as find:
+            find.return_value = None
+            blocking = render_to_string("_css.html", {"layout": "x"})
+            caches["template_fragments"].clear()
+            with tempfile.NamedTemporaryFile("w", suffix=".css") as built:
+                built.write(".navbar{display:flex}")
+                built.flush()
+                find.return_value = built.name
+                inlined = render_to_string("_css.html", {"layout": "x"})
+        caches["template_fragments"].clear()
+        self.assertIn('rel="stylesheet"', blocking)
+        self.assertNotIn("<style>", blocking)
+        self.assertIn("<style>.navbar{display:flex}</style>", inlined)
+        self.assertIn('rel="preload"', inlined)
+
+    def test_integrity_mismatch_is_rejected(self):
+        data = b"jquery"
+        digest = base64.b64encode(hashlib.sha384(data).digest()).decode()
+        check_integrity(data, f"sha384-{digest}")
+        with self.assertRaises(IntegrityError):
+            check_integrity(b"tampered", f"sha384-{digest}")
@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from syafiqkaydotcom.db.instrumentation import (
+    QueryInstrumentationMiddleware,
+    RepeatedQueryError,
+    normalize_sql,
+)
+
+
+class QueryInstrumentationTest(TestCase):
+    def middleware(self, lookups):
+        def view(request):
+            for _ in range(lookups):
+                User.objects.filter(pk=1).exists()
+            return HttpResponse()
+
+        return QueryInstrumentationMiddleware(view)
+
+    def test_literals_and_in_lists_are_normalized(self):
+        self.assertEqual(
+            normalize_sql("SELECT 1 FROM t WHERE a = 'x''y' AND id IN (%s, %s, %s)"),
+            "SELECT ? FROM t WHERE a = ? AND id IN (...)",
+        )
+
+    @override_settings(QUERY_REPEAT_THRESHOLD=3, QUERY_REPEAT_RAISE=False)
+    def test_reports_queries_in_server_timing_and_logs(self):
+        with self.assertLogs("syafiqkaydotcom.queries", "INFO") as logs:
+            response = self.middleware(3)(RequestFactory().get("/"))
+        self.assertRegex(
+            response["Server-Timing"], r'^db;dur=[\d.]+;desc="3 queries, 2 duplicate"$'
+        )
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("queries=3", logs.output[0])
+
+    @override_settings(QUERY_REPEAT_THRESHOLD=3, QUERY_REPEAT_RAISE=False)
+    def test_repeated_queries_are_logged(self):
+        with self.assertLogs("syafiqkaydotcom.queries", "WARNING") as logs:
+            self.middleware(4)(RequestFactory().get("/"))
+        self.assertIn("ran the same query 4 times", logs.output[0])
+
+    @override_settings(QUERY_REPEAT_THRESHOLD=3, QUERY_REPEAT_RAISE=True)
+    def test_repeated_queries_raise_when_configured(self):
+        with self.assertRaises(RepeatedQueryError):
+            self.middleware(4)(RequestFactory().get("/"))
+
+    @override_settings(QUERY_REPEAT_THRESHOLD=3, QUERY_REPEAT_RAISE=False)
+    async def test_counts_queries_of_async_views(self):
+        async def view(request):
+            await User.objects.filter(pk=1).aexists()
+            return HttpResponse()
+
+        middleware = QueryInstrumentationMiddleware(view)
+        response = await middleware(RequestFactory().get("/"))
+        self.assertIn('desc="1 queries, 0 duplicate"', response["Server-Timing"])
+
+    @override_settings(QUERY_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_instrumented(self):
+        response = self.middleware(1)(RequestFactory().get("/"))
+        self.assertNotIn("Server-Timing", response)
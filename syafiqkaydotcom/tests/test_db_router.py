@@ -0,0 +1,104 @@
+import contextvars
+import math
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from syafiqkaydotcom.db.router import (
+    PIN_COOKIE_NAME,
+    ReplicaLagMonitor,
+    ReplicaPinningMiddleware,
+    ReplicaRouter,
+    lag_monitor,
+)
+from taskmanager.models import Task
+
+from .utils import FakeClock
+
+
+def in_fresh_context(test):
+    """Run ``test`` with request-scoped context variables at their defaults."""
+
+    def wrapper(*args, **kwargs):
+        return contextvars.Context().run(test, *args, **kwargs)
+
+    return wrapper
+
+
+@override_settings(
+    REPLICA_DATABASES=["replica0", "replica1"],
+    REPLICA_MAX_LAG=5,
+    REPLICA_LAG_CHECK_INTERVAL=5,
+)
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.lag = {"replica0": 0.0, "replica1": 0.0}
+        patcher = mock.patch.object(lag_monitor, "lag", side_effect=self.lag.get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @in_fresh_context
+    def test_task_reads_go_to_fresh_replicas(self):
+        self.lag["replica1"] = 30
+        self.assertEqual(self.router.db_for_read(Task), "replica0")
+        self.assertIsNone(self.router.db_for_read(User))
+        self.lag["replica0"] = 30
+        self.assertEqual(self.router.db_for_read(Task), "default")
+
+    @in_fresh_context
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        self.assertEqual(self.router.db_for_write(Task), "default")
+        self.assertEqual(self.router.db_for_read(Task), "default")
+
+    def test_replicas_are_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica0", "taskmanager"))
+        self.assertIsNone(self.router.allow_migrate("default", "taskmanager"))
+
+    @in_fresh_context
+    def test_middleware_pins_writers_and_their_next_requests(self):
+        factory = RequestFactory()
+        reads = []
+
+        def view(request):
+            reads.append(router.db_for_read(Task))
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(view)
+        post = middleware(factory.post("/"))
+        middleware(factory.get("/"))
+        pinned_get = factory.get("/")
+        pinned_get.COOKIES[PIN_COOKIE_NAME] = "1"
+        middleware(pinned_get)
+        self.assertEqual(reads[0], "default")
+        self.assertTrue(reads[1].startswith("replica"))
+        self.assertEqual(reads[2], "default")
+        self.assertEqual(post.cookies[PIN_COOKIE_NAME]["max-age"], 10)
+
+    def test_lag_is_measured_once_per_interval(self):
+        clock = FakeClock()
+        monitor = ReplicaLagMonitor(clock=clock)
+        with mock.patch.object(monitor, "measure", return_value=2.0) as measure:
+            self.assertEqual(monitor.lag("replica0"), 2.0)
+            clock.now = 4
+            monitor.lag("replica0")
+            self.assertEqual(measure.call_count, 1)
+            clock.now = 5
+            monitor.lag("replica0")
+            self.assertEqual(measure.call_count, 2)
+
+    def test_unmeasured_replicas_are_skipped_until_measured(self):
+        monitor = ReplicaLagMonitor(clock=FakeClock())
+        lags = []
+
+        def measure(alias):
+            # Another thread asks while the first measurement is running.
+            lags.append(monitor.lag(alias))
+            return 1.0
+
+        with mock.patch.object(monitor, "measure", side_effect=measure):
+            self.assertEqual(monitor.lag("replica0"), 1.0)
+        self.assertEqual(lags, [math.inf])
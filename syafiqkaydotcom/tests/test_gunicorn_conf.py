@@ -0,0 +1,39 @@
+import os
+import runpy
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+class GunicornConfigTest(SimpleTestCase):
+    def load_config(self, **environ):
+        with mock.patch.dict(os.environ, environ):
+            return runpy.run_path(str(settings.BASE_DIR / "gunicorn.conf.py"))
+
+    def test_serves_the_project_with_preload_and_recycling(self):
+        config = self.load_config()
+        self.assertEqual(config["wsgi_app"], "syafiqkaydotcom.wsgi:application")
+        self.assertTrue(config["preload_app"])
+        self.assertEqual(config["workers"], config["available_cpus"]() + 1)
+        self.assertGreater(config["max_requests_jitter"], 0)
+
+    def test_environment_overrides_sizing(self):
+        config = self.load_config(WEB_CONCURRENCY="3", GUNICORN_THREADS="8")
+        self.assertEqual((config["workers"], config["threads"]), (3, 8))
+
+    def test_asgi_mode_runs_uvicorn_workers(self):
+        config = self.load_config(SERVER_MODE="asgi")
+        self.assertEqual(config["wsgi_app"], "syafiqkaydotcom.asgi:application")
+        self.assertEqual(config["worker_class"], "uvicorn_worker.UvicornWorker")
+        self.assertNotIn("threads", config)
+
+    def test_workers_warm_connections_after_fork(self):
+        config = self.load_config()
+        server = mock.Mock()
+        server.cfg.preload_app = True
+        warm = mock.Mock(return_value=["replica0"])
+        with mock.patch("syafiqkaydotcom.warmup.warm_database_connections", warm):
+            config["post_fork"](server, mock.Mock(pid=42))
+        warm.assert_called_once_with()
+        server.log.warning.assert_called_once()
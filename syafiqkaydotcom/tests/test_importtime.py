@@ -0,0 +1,43 @@
+import os
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from homepage.management.commands.importtime import (
+    by_package,
+    measure_imports,
+    parse_importtime,
+)
+
+
+class ImportTimeTest(SimpleTestCase):
+    OUTPUT = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   django.utils\n"
+        "import time:       300 |        420 | django\n"
+        "import time:        80 |         80 | dotenv.main\n"
+        "System check identified no issues (0 silenced).\n"
+    )
+
+    def test_parses_importtime_lines(self):
+        timings = parse_importtime(self.OUTPUT)
+        modules = [timing.module for timing in timings]
+        self.assertEqual(modules, ["django.utils", "django", "dotenv.main"])
+        self.assertEqual((timings[1].self_us, timings[1].cumulative_us), (300, 420))
+
+    def test_groups_by_top_level_package(self):
+        totals = by_package(parse_importtime(self.OUTPUT))
+        self.assertEqual(totals, [("django", [420, 2]), ("dotenv", [80, 1])])
+
+    def test_settings_skip_unconfigured_integrations(self):
+        environ = {
+            name: value
+            for name, value in os.environ.items()
+            if name not in ("DATABASE_URL", "AZURE_ACCOUNT_NAME")
+        }
+        with mock.patch.dict(os.environ, environ, clear=True):
+            modules = {timing.module for timing in measure_imports("settings")}
+        self.assertIn("syafiqkaydotcom.db", modules)
+        # python-dotenv is still loaded when a .env file exists.
+        for integration in ("dj_database_url", "storages", "azure"):
+            self.assertNotIn(integration, modules)
@@ -0,0 +1,94 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from syafiqkaydotcom.metrics import CONTENT_TYPE, Registry, collect
+
+
+@override_settings(METRICS_DIR=None, METRICS_TOKEN=None)
+class MetricsTest(TestCase):
+    def setUp(self):
+        patcher = mock.patch("syafiqkaydotcom.metrics.registry", Registry())
+        self.registry = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests_are_exposed_per_route(self):
+        self.client.get(reverse("homepage:homepage"))
+        self.client.get("/no-such-page/")
+        body = self.client.get(reverse("metrics")).content.decode()
+        route = 'route="homepage:homepage"'
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{le="+Inf",{route}}} 1', body
+        )
+        self.assertIn(f'http_request_duration_seconds_count{{{route}}} 1', body)
+        self.assertIn(f'http_requests_total{{{route},status="200"}} 1', body)
+        self.assertIn('http_requests_total{route="unmatched",status="404"} 1', body)
+        self.assertIn(f"http_db_instrumented_requests_total{{{route}}} 1", body)
+
+    def test_buckets_are_cumulative(self):
+        self.registry.observe_request("r", 200, 0.03)
+        values = self.registry.snapshot()
+
+        def bucket(le):
+            return values.get(
+                ("http_request_duration_seconds_bucket", (("le", le), ("route", "r")))
+            )
+
+        self.assertIsNone(bucket("0.025"))
+        self.assertEqual(bucket("0.05"), 1)
+        self.assertEqual(bucket("10.0"), 1)
+
+    def test_processes_are_summed_and_exited_ones_kept(self):
+        with tempfile.TemporaryDirectory() as directory:
+            exited = Registry()
+            exited.observe_request("r", 200, 0.2)
+            exited.flush(directory)
+            # A pid above pid_max never belongs to a running process.
+            Path(directory, f"{os.getpid()}.json").rename(
+                Path(directory, "9999999.json")
+            )
+            self.registry.observe_request("r", 500, 0.2)
+            self.registry.flush(directory)
+
+            values = collect(directory)
+            again = collect(directory)
+            files = sorted(path.name for path in Path(directory).glob("*.json"))
+
+        count = ("http_request_duration_seconds_count", (("route", "r"),))
+        self.assertEqual(values[count], 2)
+        self.assertEqual(again, values)
+        self.assertEqual(files, [f"{os.getpid()}.json", "exited.json"])
+
+    def test_concurrent_flushes_do_not_collide(self):
+        self.registry.observe_request("r", 200, 0.1)
+        with tempfile.TemporaryDirectory() as directory:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [
+                    pool.submit(self.registry.flush, directory, force=True)
+                    for _ in range(200)
+                ]
+            for future in futures:
+                future.result()
+            files = [path.name for path in Path(directory).iterdir()]
+        self.assertEqual(files, [f"{os.getpid()}.json"])
+
+    @override_settings(METRICS_DIR="/dev/null/metrics")
+    def test_write_errors_are_logged_not_raised(self):
+        with self.assertLogs("syafiqkaydotcom.metrics", "WARNING"):
+            response = self.client.get(reverse("homepage:homepage"))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token_is_required_when_configured(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        response = self.client.get(
+            reverse("metrics"), headers={"authorization": "Bearer s3cret"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], CONTENT_TYPE)
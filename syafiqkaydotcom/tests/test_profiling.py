@@ -0,0 +1,61 @@
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from syafiqkaydotcom import profiling
+from syafiqkaydotcom.profiling import ProfilingMiddleware, has_valid_token, make_token
+
+
+def busy_view(request):
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+    return HttpResponse()
+
+
+class ProfilingTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        storage = FileSystemStorage(location=directory.name)
+        patcher = mock.patch("syafiqkaydotcom.profiling.profile_storage", storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.middleware = ProfilingMiddleware(busy_view)
+
+    def profiles(self):
+        profiling.executor.submit(lambda: None).result()  # wait for uploads
+        return list(self.directory.rglob("*.collapsed"))
+
+    @override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_INTERVAL=0.001)
+    def test_sampled_requests_save_collapsed_stacks(self):
+        response = self.middleware(RequestFactory().get("/"))
+        (profile,) = self.profiles()
+        name = profile.relative_to(self.directory).as_posix()
+        self.assertIn(f'profile;desc="{name}"', response["Server-Timing"])
+        lines = profile.read_text().splitlines()
+        self.assertTrue(any(";busy_view (syafiqkaydotcom/tests/test_profiling.py:" in line for line in lines))
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_only_signed_headers_turn_profiling_on(self):
+        self.middleware(RequestFactory().get("/", headers={"X-Profile": "forged"}))
+        self.middleware(RequestFactory().get("/"))
+        self.assertEqual(self.profiles(), [])
+        self.middleware(RequestFactory().get("/", headers={"X-Profile": make_token()}))
+        self.assertEqual(len(self.profiles()), 1)
+
+    def test_profile_token_command_prints_the_header(self):
+        stdout = StringIO()
+        call_command("profile_token", stdout=stdout, stderr=StringIO())
+        header, token = stdout.getvalue().strip().split(": ")
+        request = RequestFactory().get("/", headers={header: token})
+        self.assertTrue(has_valid_token(request))
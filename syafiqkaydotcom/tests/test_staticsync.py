@@ -0,0 +1,59 @@
+import hashlib
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from syafiqkaydotcom.staticsync import SYNC_MANIFEST_NAME, sync_static
+
+from .utils import PrecompressedManifestStorage
+
+
+class StaticSyncTest(SimpleTestCase):
+    def setUp(self):
+        source_dir = tempfile.TemporaryDirectory()
+        target_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(source_dir.cleanup)
+        self.addCleanup(target_dir.cleanup)
+        self.source = Path(source_dir.name)
+        (self.source / "css").mkdir()
+        (self.source / "css/site.css").write_text("body { background: url(../img/a.png) }")
+        (self.source / "img").mkdir()
+        (self.source / "img/a.png").write_bytes(b"png")
+        (self.source / "img/b.png").write_bytes(b"other")
+        self.target = target_dir.name
+        settings_override = override_settings(
+            STATICFILES_DIRS=[self.source],
+            STATICFILES_FINDERS=[
+                "django.contrib.staticfiles.finders.FileSystemFinder"
+            ],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def storage(self):
+        # A fresh instance per run, as each container start would have.
+        return PrecompressedManifestStorage(location=self.target)
+
+    def test_second_run_uploads_nothing(self):
+        first = sync_static(self.storage())
+        self.assertEqual(first.uploaded, ["css/site.css", "img/a.png", "img/b.png"])
+        second = sync_static(self.storage())
+        self.assertEqual((second.found, second.uploaded), (3, []))
+        self.assertTrue(self.storage().exists(SYNC_MANIFEST_NAME))
+
+    def test_changed_file_is_uploaded_and_referrers_are_rehashed(self):
+        sync_static(self.storage())
+        old_css = self.storage().stored_name("css/site.css")
+        (self.source / "img/a.png").write_bytes(b"new png")
+        result = sync_static(self.storage())
+        self.assertEqual(result.uploaded, ["img/a.png"])
+        storage = self.storage()
+        self.assertNotEqual(storage.stored_name("css/site.css"), old_css)
+        self.assertEqual(
+            storage.stored_name("img/b.png"), f"img/b.{self._md5(b'other')}.png"
+        )
+
+    @staticmethod
+    def _md5(data):
+        return hashlib.md5(data, usedforsecurity=False).hexdigest()[:12]
@@ -0,0 +1,86 @@
+import gzip
+import os
+import subprocess
+import sys
+import tempfile
+
+import brotli
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+
+from syafiqkaydotcom.storage import (
+    IMMUTABLE_CACHE_CONTROL,
+    PAGE_CACHE_CONTROL,
+    PageStorage,
+    StaticManifestStorage,
+)
+
+from .utils import PrecompressedManifestStorage
+
+
+def production_storage(**environ):
+    """Return STATICFILES_STORAGE of the production profile under ``environ``."""
+    environ = {**os.environ, "AZURE_ACCOUNT_NAME": "", **environ}
+    script = (
+        "from syafiqkaydotcom import settings_production; "
+        "print(settings_production.STATICFILES_STORAGE)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=settings.BASE_DIR,
+        env=environ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+class StaticStorageTest(SimpleTestCase):
+    def setUp(self):
+        source_dir = tempfile.TemporaryDirectory()
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(source_dir.cleanup)
+        self.addCleanup(output_dir.cleanup)
+        self.source = FileSystemStorage(location=source_dir.name)
+        self.output = output_dir.name
+
+    def test_hashed_text_assets_get_compressed_variants(self):
+        css = b"body { color: red; }\n" * 50
+        self.source.save("css/site.css", ContentFile(css))
+        storage = PrecompressedManifestStorage(location=self.output)
+        list(storage.post_process({"css/site.css": (self.source, "css/site.css")}))
+        hashed = storage.stored_name("css/site.css")
+        self.assertNotEqual(hashed, "css/site.css")
+        with storage.open(f"{hashed}.gz") as variant:
+            self.assertEqual(gzip.decompress(variant.read()), css)
+        with storage.open(f"{hashed}.br") as variant:
+            self.assertEqual(brotli.decompress(variant.read()), css)
+        self.assertFalse(storage.exists("css/site.css.gz"))
+
+    def test_only_hashed_names_are_immutable(self):
+        storage = StaticManifestStorage(
+            manifest_storage=FileSystemStorage(location=self.output)
+        )
+        params = storage.get_object_parameters("js/app.0123456789ab.js")
+        self.assertEqual(params["cache_control"], IMMUTABLE_CACHE_CONTROL)
+        self.assertNotIn("cache_control", storage.get_object_parameters("js/app.js"))
+        self.assertNotIn(
+            "cache_control", storage.get_object_parameters(storage.manifest_name)
+        )
+
+    def test_prerendered_pages_are_cached_briefly(self):
+        params = PageStorage().get_object_parameters("pages/index.html")
+        self.assertEqual(params["cache_control"], PAGE_CACHE_CONTROL)
+
+    def test_production_uses_azure_only_when_configured(self):
+        self.assertEqual(
+            production_storage(),
+            "django.contrib.staticfiles.storage.ManifestStaticFilesStorage",
+        )
+        self.assertEqual(
+            production_storage(AZURE_ACCOUNT_NAME="example"),
+            "syafiqkaydotcom.storage.StaticManifestStorage",
+        )
@@ -0,0 +1,42 @@
+from importlib import import_module
+from unittest import mock
+
+from django.conf import settings
+from django.db import OperationalError
+from django.test import SimpleTestCase
+
+from syafiqkaydotcom.warmup import (
+    iter_template_names,
+    warm_database_connections,
+    warm_templates,
+)
+
+
+class WarmTemplatesTest(SimpleTestCase):
+    def test_compiles_every_project_template(self):
+        names = {name for _, name in iter_template_names()}
+        self.assertIn("homepage/base.html", names)
+        self.assertIn("_css.html", names)
+        self.assertEqual(warm_templates(), (len(names), {}))
+
+    def test_production_profile_uses_cached_loader(self):
+        production = import_module("syafiqkaydotcom.settings_production")
+        options = production.TEMPLATES[0]["OPTIONS"]
+        self.assertFalse(production.DEBUG)
+        self.assertEqual(
+            options["loaders"][0][0], "django.template.loaders.cached.Loader"
+        )
+        self.assertEqual(
+            options["context_processors"],
+            settings.TEMPLATES[0]["OPTIONS"]["context_processors"],
+        )
+
+    def test_connection_warmup_reports_unreachable_databases(self):
+        working, broken = mock.Mock(alias="default"), mock.Mock(alias="replica0")
+        broken.ensure_connection.side_effect = OperationalError
+        with mock.patch("syafiqkaydotcom.warmup.connections") as connections:
+            connections.all.return_value = [working, broken]
+            with self.assertLogs("syafiqkaydotcom.warmup", "WARNING"):
+                self.assertEqual(warm_database_connections(), ["replica0"])
+        working.close.assert_called_once_with()
+        broken.close.assert_called_once_with()
@@ -0,0 +1,17 @@
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from syafiqkaydotcom.storage import PrecompressedMixin
+
+
+class FakeClock:
+    """A settable ``clock`` for classes that take one."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class PrecompressedManifestStorage(PrecompressedMixin, ManifestStaticFilesStorage):
+    """Manifest storage on the local filesystem with compressed variants."""
@@ -1,8 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from .metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('homepage.urls', 'homepage')),
     path('taskmanager/', include('taskmanager.urls', 'taskmanager')),
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -0,0 +1,109 @@
+"""Pre-compile templates, import the static storage backend and open database
+connections before serving requests."""
+
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def iter_template_files(include_apps=False):
+    """Yield ``(engine, template_name, path)`` for every file in the template dirs.
+
+    Only the project's ``DIRS`` are walked unless ``include_apps`` is set, in
+    which case every installed app's ``templates/`` directory is included too.
+    A name found in several directories is only yielded for the first, which
+    is the one the loaders would pick.
+    """
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        dirs = list(engine.engine.dirs)
+        if include_apps:
+            dirs += get_app_template_dirs("templates")
+        seen = set()
+        for directory in map(Path, dirs):
+            for path in sorted(directory.rglob("*")):
+                name = path.relative_to(directory).as_posix()
+                if path.is_file() and name not in seen:
+                    seen.add(name)
+                    yield engine, name, path
+
+
+def iter_template_names(include_apps=False):
+    """Yield ``(engine, template_name)`` for every file in the template dirs."""
+    for engine, name, _ in iter_template_files(include_apps):
+        yield engine, name
+
+
+def warm_templates(include_apps=False):
+    """Load every template once so the cached loader holds it compiled.
+
+    Returns:
+        tuple: ``(compiled, errors)`` where ``errors`` maps template names to
+        the syntax error raised while compiling them.
+    """
+    compiled, errors = 0, {}
+    for engine, name in iter_template_names(include_apps):
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError as exc:
+            errors[name] = exc
+        else:
+            compiled += 1
+    return compiled, errors
+
+
+def warm_on_boot():
+    """Prepare a freshly loaded application for its first request.
+
+    The static files storage backend is imported here, since every page needs
+    it for asset URLs; a preloading gunicorn master then imports the Azure SDK
+    once for all workers. Templates are compiled too if
+    ``WARM_TEMPLATES_ON_BOOT`` is enabled.
+    """
+    import_string(settings.STATICFILES_STORAGE)
+    if getattr(settings, "WARM_TEMPLATES_ON_BOOT", False):
+        warm_templates()
+
+
+def warm_database_connections():
+    """Connect every configured database once, then hand the connection back.
+
+    With pooled backends the connection stays open in the pool, so the first
+    request skips the TCP/TLS handshake and authentication. Failures are
+    logged, not raised: a worker should still start while a database is down.
+
+    Returns:
+        list: Aliases that could not be connected.
+    """
+    failed = []
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+        except DatabaseError:
+            logger.warning("Could not warm %s.", connection.alias, exc_info=True)
+            failed.append(connection.alias)
+        finally:
+            connection.close()
+    return failed
+
+
+def close_connection_pools():
+    """Close every database connection and pool of this process.
+
+    Run in a server's master process before it forks, so no worker inherits
+    a socket that another process is using.
+    """
+    for connection in connections.all():
+        close_pools = getattr(type(connection), "close_pools", None)
+        if close_pools is not None:
+            close_pools()
+    connections.close_all()
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'syafiqkaydotcom.settings')
 
 application = get_wsgi_application()
+
+from .warmup import warm_on_boot  # noqa: E402  (needs settings configured)
+
+warm_on_boot()
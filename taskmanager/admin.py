@@ -1,3 +1,12 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("title", "owner", "status", "priority", "due", "updated_at")
+    list_filter = ("status", "priority")
+    search_fields = ("title",)
+    raw_id_fields = ("owner",)
+    date_hierarchy = "due"
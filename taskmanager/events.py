@@ -0,0 +1,237 @@
+"""Live task updates, pushed to open tabs as Server-Sent Events.
+
+Saving or deleting a task publishes a small event on its owner's channel
+(see ``signals``). ``task_events`` keeps one streaming response open per tab
+and relays the events of the signed-in user's channel from ``broker``:
+
+* ``InProcessBroker`` fans out to the streams of the current process only,
+  which is enough for a single worker and for development.
+* ``PostgresBroker`` sends events through ``NOTIFY`` and has each process
+  ``LISTEN`` on one connection, so every worker hears every write.
+
+Streams are async generators on the worker's event loop, so an idle tab costs
+a queue and a timer rather than a thread or a database connection, and a
+process can hold thousands of them. A subscriber that falls too far behind
+is sent ``resync`` instead of the events it missed, and reloads.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import partial
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 100
+RESYNC = {"type": "resync"}
+# Milliseconds EventSource waits before reconnecting a dropped stream.
+RETRY_MS = 5000
+
+
+def task_event(task, created=False, deleted=False, previous_status=None):
+    """Describe a change to ``task`` as a JSON-serializable event.
+
+    ``completed`` is reported when a save moves the task to done from
+    ``previous_status``; any other save is ``updated``.
+    """
+    if deleted:
+        return {"type": "deleted", "task": {"id": task.pk}}
+    if created:
+        kind = "created"
+    elif task.status == Task.Status.DONE and previous_status != Task.Status.DONE:
+        kind = "completed"
+    else:
+        kind = "updated"
+    return {
+        "type": kind,
+        "task": {
+            "id": task.pk,
+            "title": task.title,
+            "status": task.status,
+            "status_display": task.get_status_display(),
+            "is_open": task.is_open,
+            "priority": task.priority,
+            "priority_display": task.get_priority_display(),
+            "due": task.due,
+        },
+    }
+
+
+def format_event(message):
+    """Encode ``message`` as one SSE frame; the event name is its type."""
+    data = json.dumps(message, cls=DjangoJSONEncoder)
+    return f"event: {message['type']}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """The queue of events waiting for one stream, owned by its event loop."""
+
+    def __init__(self, loop, maxsize=QUEUE_SIZE):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+
+    def deliver(self, message):
+        # Runs on self.loop.
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InProcessBroker:
+    """Fan events out to the subscriptions of the current process."""
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def publish(self, channel, message, using=DEFAULT_DB_ALIAS):
+        """Send ``message`` to ``channel`` once the write on ``using`` commits."""
+        transaction.on_commit(partial(self.fan_out, channel, message), using=using)
+
+    def fan_out(self, channel, message):
+        """Deliver ``message`` to this process's subscribers; thread-safe."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:  # The subscriber's loop has closed.
+                pass
+
+    def broadcast(self, message):
+        """Deliver ``message`` to every subscriber of this process."""
+        with self._lock:
+            channels = list(self._subscriptions)
+        for channel in channels:
+            self.fan_out(channel, message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscriptions[channel].discard(subscription)
+                if not self._subscriptions[channel]:
+                    del self._subscriptions[channel]
+
+
+class PostgresBroker(InProcessBroker):
+    """Fan events out across processes with PostgreSQL ``LISTEN``/``NOTIFY``.
+
+    Each process opens one autocommit connection to ``using`` when its first
+    stream subscribes and keeps it for as long as the process lives,
+    reconnecting after errors. ``NOTIFY`` is transactional, so listeners only
+    hear about writes that commit.
+    """
+
+    notify_channel = "task_events"
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, reconnect_delay=5, **kwargs):
+        super().__init__(**kwargs)
+        self.using = using
+        self.reconnect_delay = reconnect_delay
+        self._listener = None
+
+    def publish(self, channel, message, using=None):
+        payload = json.dumps(
+            {"channel": channel, "message": message}, cls=DjangoJSONEncoder
+        )
+        with connections[using or self.using].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.notify_channel, payload])
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        self._ensure_listening()
+        async with super().subscribe(channel) as subscription:
+            yield subscription
+
+    def _ensure_listening(self):
+        loop = asyncio.get_running_loop()
+        listener = self._listener
+        if listener is None or listener.done() or listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen())
+
+    def connection_params(self):
+        params = connections[self.using].get_connection_params()
+        # Django's are synchronous cursor settings.
+        params.pop("cursor_factory", None)
+        params.pop("context", None)
+        return params
+
+    async def _listen(self):
+        import psycopg
+
+        reconnecting = False
+        while True:
+            try:
+                connection = await psycopg.AsyncConnection.connect(
+                    **self.connection_params(), autocommit=True
+                )
+                async with connection:
+                    await connection.execute(f"LISTEN {self.notify_channel}")
+                    if reconnecting:
+                        # Events sent while disconnected are lost.
+                        self.broadcast(RESYNC)
+                    reconnecting = False
+                    async for notify in connection.notifies():
+                        self.handle_notify(notify.payload)
+            except psycopg.Error:
+                logger.warning(
+                    "Lost the task events connection; retrying in %ss.",
+                    self.reconnect_delay,
+                    exc_info=True,
+                )
+            reconnecting = True
+            await asyncio.sleep(self.reconnect_delay)
+
+    def handle_notify(self, payload):
+        data = json.loads(payload)
+        self.fan_out(data["channel"], data["message"])
+
+
+async def stream_events(channel, heartbeat=None):
+    """Yield SSE frames for ``channel`` until the client disconnects.
+
+    A comment is sent every ``heartbeat`` seconds without events, so proxies
+    keep the connection open and dead clients are noticed.
+    """
+    heartbeat = heartbeat or settings.TASK_EVENTS_HEARTBEAT
+    yield f"retry: {RETRY_MS}\n\n"
+    async with broker.subscribe(channel) as subscription:
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), heartbeat)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_event(message)
+
+
+def _create_broker():
+    config = settings.TASK_EVENTS_BROKER
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+broker = SimpleLazyObject(_create_broker)
@@ -0,0 +1,122 @@
+"""Apply queued task changes to the full-text search index in batches.
+
+Saving or deleting a task only appends a ``SearchOutbox`` row (see
+``taskmanager.signals``). The functions here do the actual indexing and are
+driven by ``manage.py reindex_tasks``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections, transaction
+from django.db.models import Max, Min
+
+from .models import SearchOutbox, Task
+from .search import get_backend
+
+
+def process_outbox(batch_size=500, using="default"):
+    """Index one batch of queued changes and remove them from the outbox.
+
+    Concurrent workers skip rows another worker has locked, on databases
+    that support it, so several can drain the queue at once.
+
+    Returns:
+        int: The number of outbox rows processed.
+    """
+    with transaction.atomic(using=using):
+        entries = list(
+            SearchOutbox.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .values_list("id", "task_id")[:batch_size]
+        )
+        if not entries:
+            return 0
+        entry_ids, task_ids = zip(*entries)
+        # A task edited several times is queued several times.
+        get_backend(using).refresh(sorted(set(task_ids)))
+        SearchOutbox.objects.using(using).filter(id__in=entry_ids).delete()
+    return len(entries)
+
+
+def drain_outbox(batch_size=500, using="default"):
+    """Process batches until the outbox is empty and return the row count."""
+    total = 0
+    while processed := process_outbox(batch_size, using):
+        total += processed
+    return total
+
+
+def reindex_since(since, batch_size=500, using="default"):
+    """Re-index tasks updated at or after ``since``.
+
+    Used to catch up after the worker was down. Deleted tasks leave no trace
+    in the task table, so their documents are only removed via the outbox or
+    a full ``rebuild``.
+
+    Returns:
+        int: The number of tasks re-indexed.
+    """
+    task_ids = (
+        Task.objects.using(using)
+        .filter(updated_at__gte=since)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    backend = get_backend(using)
+    total = 0
+    batch = []
+    for task_id in task_ids.iterator(chunk_size=batch_size):
+        batch.append(task_id)
+        if len(batch) == batch_size:
+            with transaction.atomic(using=using):
+                backend.refresh(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        with transaction.atomic(using=using):
+            backend.refresh(batch)
+        total += len(batch)
+    return total
+
+
+def _index_range(first_id, last_id, using):
+    try:
+        with transaction.atomic(using=using):
+            get_backend(using).index_range(first_id, last_id)
+    finally:
+        # Each pool thread opened its own connection; don't leak it.
+        connections[using].close()
+
+
+def rebuild(batch_size=10_000, workers=4, using="default"):
+    """Rebuild the index from the task table.
+
+    Id ranges of ``batch_size`` are re-indexed concurrently by ``workers``
+    threads, each on its own connection, and documents of deleted tasks are
+    pruned at the end. The live index is updated in place and never
+    cleared, so search keeps answering and the outbox worker can keep
+    running meanwhile. SQLite allows a single writer, so it always rebuilds
+    on one thread.
+
+    Returns:
+        int: The number of id ranges indexed.
+    """
+    if connections[using].vendor == "sqlite":
+        workers = 1
+    bounds = Task.objects.using(using).aggregate(first=Min("id"), last=Max("id"))
+    ranges = []
+    if bounds["first"] is not None:
+        ranges = [
+            (start, min(start + batch_size - 1, bounds["last"]))
+            for start in range(bounds["first"], bounds["last"] + 1, batch_size)
+        ]
+    if workers == 1:
+        for first_id, last_id in ranges:
+            with transaction.atomic(using=using):
+                get_backend(using).index_range(first_id, last_id)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda bounds: _index_range(*bounds, using), ranges))
+    with transaction.atomic(using=using):
+        get_backend(using).prune()
+    return len(ranges)
@@ -0,0 +1,79 @@
+"""Helpers shared by the ``benchmark_*`` management commands."""
+
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from taskmanager.models import Task
+
+# Roughly a third of tasks stay open; the rest is the long tail of finished work.
+STATUS_MIX = [
+    Task.Status.TODO,
+    Task.Status.IN_PROGRESS,
+    Task.Status.DONE,
+    Task.Status.DONE,
+    Task.Status.DONE,
+    Task.Status.CANCELLED,
+]
+
+
+def create_owners(count, prefix="bench-"):
+    User = get_user_model()
+    User.objects.bulk_create(User(username=f"{prefix}{i}") for i in range(count))
+    return list(User.objects.filter(username__startswith=prefix))
+
+
+def insert_tasks(
+    rng, owners, count, batch_size=10_000, statuses=STATUS_MIX, undated=0.0
+):
+    """Bulk insert ``count`` random tasks spread across ``owners``.
+
+    A fraction ``undated`` of them gets no due date.
+    """
+    today = date.today()
+
+    def due():
+        if undated and rng.random() < undated:
+            return None
+        return today + timedelta(days=rng.randrange(-365, 365))
+
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {rng.getrandbits(32):08x}",
+                status=rng.choice(statuses),
+                priority=rng.randrange(4),
+                due=due(),
+                owner=rng.choice(owners),
+            )
+            for _ in range(size)
+        )
+        remaining -= size
+
+
+def analyze():
+    """Refresh planner statistics so the new rows use the intended indexes."""
+    if connection.vendor in ("sqlite", "postgresql"):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Task._meta.db_table}")
+
+
+def time_calls(func, repeat):
+    """Call ``func`` ``repeat`` times and return ``(median_ms, p95_ms)``."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    return statistics.median(timings), p95
+
+
+def format_timing(label, median, p95):
+    return f"  {label:<16} median {median:8.2f} ms   p95 {p95:8.2f} ms"
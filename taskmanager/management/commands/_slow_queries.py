@@ -0,0 +1,30 @@
+"""Gunicorn hooks that add a fixed delay to every database query.
+
+``benchmark_concurrency`` loads this module with ``--config python:...`` so the
+servers it compares answer like they would against a slow, remote database.
+The delay is ``BENCHMARK_QUERY_DELAY_MS`` milliseconds.
+"""
+
+import os
+import time
+
+QUERY_DELAY = float(os.environ.get("BENCHMARK_QUERY_DELAY_MS", 50)) / 1000
+
+
+def delay_query(execute, sql, params, many, context):
+    # Blocks the calling thread, as waiting on a network round trip does.
+    time.sleep(QUERY_DELAY)
+    return execute(sql, params, many, context)
+
+
+def add_delay(sender, connection, **kwargs):
+    # First in line: the connection can be created while a request's own
+    # wrappers are installed, and those are popped off the end afterwards.
+    if delay_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, delay_query)
+
+
+def post_worker_init(worker):
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(add_delay, weak=False)
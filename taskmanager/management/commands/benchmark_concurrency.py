@@ -0,0 +1,155 @@
+import asyncio
+import importlib.util
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from homepage.management.commands._server import free_port, wait_until_up
+from taskmanager.models import Task
+
+from ._benchmark import create_owners, insert_tasks
+
+APPS = {
+    "wsgi": ("syafiqkaydotcom.wsgi:application", "gthread"),
+    "asgi": ("syafiqkaydotcom.asgi:application", "uvicorn_worker.UvicornWorker"),
+}
+
+
+async def fetch(port, path, cookie):
+    """GET ``path`` over a fresh connection; return ``(status, seconds)``."""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nCookie: {cookie}\r\n"
+            "Connection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return int(status_line.split()[1]), time.perf_counter() - started
+
+
+async def burst(port, paths, cookie):
+    """Send every request in ``paths`` at once."""
+    return await asyncio.gather(
+        *(fetch(port, path, cookie) for path in paths), return_exceptions=True
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare gunicorn's WSGI (gthread) and ASGI (uvicorn) modes under a "
+        "burst of concurrent task list and detail requests, with every query "
+        "slowed down to mimic a remote database. ASGI needs "
+        "`pip install uvicorn-worker`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", nargs="+", choices=APPS, default=list(APPS))
+        parser.add_argument("--concurrency", type=int, default=500)
+        parser.add_argument(
+            "--query-delay", type=float, default=50, help="Milliseconds per query."
+        )
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--tasks", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if "asgi" in options["modes"] and not importlib.util.find_spec(
+            "uvicorn_worker"
+        ):
+            raise CommandError("ASGI mode needs `pip install uvicorn-worker`.")
+
+        # The servers run in other processes, so the data is committed and
+        # removed again at the end rather than rolled back.
+        (owner,) = create_owners(1, prefix="concurrency-")
+        client = Client()
+        try:
+            insert_tasks(
+                random.Random(options["seed"]),
+                [owner],
+                options["tasks"],
+                statuses=Task.Status.open_values(),
+            )
+            client.force_login(owner)
+            session = client.cookies[settings.SESSION_COOKIE_NAME]
+            cookie = f"{session.key}={session.value}"
+            task_ids = list(Task.objects.for_owner(owner).values_list("pk", flat=True))
+            pages = [reverse("taskmanager:home")] + [
+                reverse("taskmanager:detail", args=[pk]) for pk in task_ids
+            ]
+            paths = [pages[i % len(pages)] for i in range(options["concurrency"])]
+
+            self.stdout.write(
+                f"{options['concurrency']} concurrent requests, "
+                f"{options['query_delay']:g} ms per query, "
+                f"{options['workers']} workers"
+            )
+            for mode in options["modes"]:
+                self._run(mode, paths, cookie, options)
+        finally:
+            Session.objects.filter(session_key=client.session.session_key).delete()
+            owner.delete()
+
+    def _run(self, mode, paths, cookie, options):
+        app, worker_class = APPS[mode]
+        port = free_port()
+        command = [
+            sys.executable, "-m", "gunicorn", app,
+            "--config", "python:taskmanager.management.commands._slow_queries",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(options["workers"]),
+            "--worker-class", worker_class,
+            "--threads", str(options["threads"]),
+            "--backlog", str(max(2048, 2 * len(paths))),
+        ]
+        environ = {
+            **os.environ,
+            "SERVER_MODE": mode,
+            "BENCHMARK_QUERY_DELAY_MS": str(options["query_delay"]),
+        }
+        process = subprocess.Popen(
+            command, env=environ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_up(f"http://127.0.0.1:{port}/", timeout=60, process=process)
+            started = time.perf_counter()
+            results = asyncio.run(burst(port, paths, cookie))
+            elapsed = time.perf_counter() - started
+        finally:
+            process.terminate()
+            process.wait()
+
+        timings = sorted(
+            seconds * 1000
+            for result in results
+            if not isinstance(result, BaseException)
+            for status, seconds in [result]
+            if status == 200
+        )
+        failed = len(results) - len(timings)
+        label = mode if mode == "asgi" else f"{mode} ({options['threads']} threads)"
+        self.stdout.write(self.style.MIGRATE_HEADING(label))
+        if not timings:
+            self.stdout.write(f"  all {failed} requests failed")
+            return
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f"  {len(results) / elapsed:7.1f} req/s   "
+            f"median {statistics.median(timings):8.1f} ms   p95 {p95:8.1f} ms   "
+            f"max {timings[-1]:8.1f} ms   failed {failed}"
+        )
@@ -0,0 +1,67 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from taskmanager.models import Task
+from taskmanager.pagination import KeysetPaginator, encode_cursor
+from taskmanager.views import TASKS_PER_PAGE
+
+from ._benchmark import analyze, create_owners, format_timing, insert_tasks, time_calls
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare OFFSET and keyset pagination latency for the task list at a "
+        "shallow and a deep page. A tenth of the tasks have no due date. All "
+        "rows are rolled back when the run ends."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, nargs="+", default=[1, 10_000])
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        pages = sorted(options["pages"])
+        rows = pages[-1] * TASKS_PER_PAGE
+        self.stdout.write(f"Backend: {connection.vendor}, {rows:,} open tasks")
+
+        with transaction.atomic():
+            (owner,) = create_owners(1)
+            insert_tasks(
+                random.Random(options["seed"]),
+                [owner],
+                rows,
+                statuses=Task.Status.open_values(),
+                # Undated tasks sort last, so the deepest pages walk them.
+                undated=0.1,
+            )
+            analyze()
+            tasks = Task.objects.for_owner(owner).open().for_list()
+            paginator = KeysetPaginator(tasks, per_page=TASKS_PER_PAGE)
+
+            for number in pages:
+                offset = (number - 1) * TASKS_PER_PAGE
+                cursor = None
+                if offset:
+                    cursor = encode_cursor(paginator.queryset[offset - 1])
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Page {number:,}"))
+                self.stdout.write(
+                    format_timing(
+                        "offset",
+                        *time_calls(
+                            lambda: list(
+                                paginator.queryset[offset : offset + TASKS_PER_PAGE]
+                            ),
+                            options["repeat"],
+                        ),
+                    )
+                )
+                self.stdout.write(
+                    format_timing(
+                        "keyset",
+                        *time_calls(lambda: paginator.page(cursor), options["repeat"]),
+                    )
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,75 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from taskmanager import indexer
+from taskmanager.models import Task
+from taskmanager.search import search_tasks
+
+from ._benchmark import analyze, create_owners, format_timing, insert_tasks, time_calls
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure task list/filter latency against the configured database at "
+        "increasing table sizes. All rows are rolled back when the run ends."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[100_000, 1_000_000, 10_000_000],
+            help="Table sizes to measure at, in ascending order.",
+        )
+        parser.add_argument("--owners", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        self.stdout.write(f"Backend: {connection.vendor}")
+
+        with transaction.atomic():
+            owners = create_owners(options["owners"])
+            inserted = 0
+            for target in sorted(options["rows"]):
+                started = time.perf_counter()
+                insert_tasks(rng, owners, target - inserted, options["batch_size"])
+                self.stdout.write(
+                    f"Inserted {target - inserted} rows in "
+                    f"{time.perf_counter() - started:.1f}s"
+                )
+                inserted = target
+                # bulk_create skips the outbox signals; index everything here.
+                indexer.rebuild(workers=1)
+                analyze()
+                self._report(rng, target, owners, options["repeat"])
+            transaction.set_rollback(True)
+
+    def _report(self, rng, rows, owners, repeat):
+        queries = {
+            "list open": lambda owner: Task.objects.for_owner(owner)
+            .open()
+            .for_list()
+            .order_by("due", "id")[:50],
+            "filter done": lambda owner: Task.objects.for_owner(owner)
+            .filter(status=Task.Status.DONE)
+            .for_list()
+            .order_by("due", "id")[:50],
+            "count open": lambda owner: [Task.objects.for_owner(owner).open().count()],
+            # Titles carry a random hex word, so a two-character prefix matches
+            # roughly 1/256 of an owner's tasks.
+            "search": lambda owner: search_tasks(f"{rng.getrandbits(8):02x}", owner),
+            # Only queues a search outbox row, so this should not grow with
+            # the size of the index.
+            "create": lambda owner: [Task.objects.create(title="New", owner=owner)],
+        }
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{rows:,} rows"))
+        for label, build in queries.items():
+            median, p95 = time_calls(lambda: list(build(rng.choice(owners))), repeat)
+            self.stdout.write(format_timing(label, median, p95))
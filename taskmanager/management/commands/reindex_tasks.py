@@ -0,0 +1,108 @@
+import logging
+import time
+from datetime import datetime, time as datetime_time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from taskmanager import indexer
+
+logger = logging.getLogger(__name__)
+
+
+def parse_since(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(
+                f"--since expects an ISO date or datetime, got {value!r}."
+            )
+        moment = datetime.combine(day, datetime_time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = (
+        "Keep the task search index current. By default runs as a worker that "
+        "drains the search outbox in batches; --since and --rebuild catch up "
+        "or rebuild from the task table instead."
+    )
+
+    def add_arguments(self, parser):
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
+            "--since",
+            help="Re-index tasks updated at or after this ISO date/datetime, then exit.",
+        )
+        mode.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Re-index every task in place and prune deleted ones, then exit.",
+        )
+        mode.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit instead of polling.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Tasks per batch (default 500, or 10000 per id range for --rebuild).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Parallel threads for --rebuild.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the outbox is empty.",
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        batch_size = options["batch_size"] or 500
+
+        if options["since"]:
+            since = parse_since(options["since"])
+            count = indexer.reindex_since(since, batch_size, using)
+            self.stdout.write(f"Re-indexed {count} tasks updated since {since}.")
+        elif options["rebuild"]:
+            started = time.perf_counter()
+            ranges = indexer.rebuild(
+                options["batch_size"] or 10_000, options["workers"], using
+            )
+            self.stdout.write(
+                f"Rebuilt index from {ranges} id ranges in "
+                f"{time.perf_counter() - started:.1f}s."
+            )
+        elif options["once"]:
+            count = indexer.drain_outbox(batch_size, using)
+            self.stdout.write(f"Processed {count} outbox entries.")
+        else:
+            self._run_worker(batch_size, options["interval"], using)
+
+    def _run_worker(self, batch_size, interval, using):
+        self.stdout.write("Search index worker started.")
+        try:
+            while True:
+                try:
+                    processed = indexer.process_outbox(batch_size, using)
+                except DatabaseError:
+                    # The batch was rolled back and stays queued for a retry.
+                    logger.exception("Failed to index a search outbox batch.")
+                    connections[using].close_if_unusable_or_obsolete()
+                    processed = 0
+                if not processed:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write("Search index worker stopped.")
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-17 21:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('status', models.PositiveSmallIntegerField(choices=[(0, 'To do'), (1, 'In progress'), (2, 'Done'), (3, 'Cancelled')], default=0)),
+                ('priority', models.PositiveSmallIntegerField(choices=[(0, 'Low'), (1, 'Normal'), (2, 'High'), (3, 'Urgent')], default=1)),
+                ('due', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['due', 'id'],
+                'indexes': [models.Index(fields=['owner', 'status', 'due', 'id'], name='task_owner_status_due_idx'), models.Index(condition=models.Q(('status__in', [0, 1])), fields=['owner', 'due', 'id'], name='task_open_owner_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,109 @@
+from django.db import migrations
+
+TASK_TABLE = "taskmanager_task"
+POSTGRES_INDEX = "taskmanager_task_search_idx"
+SQLITE_FTS_TABLE = "taskmanager_task_fts"
+MSSQL_CATALOG = "taskmanager_catalog"
+
+# Must stay identical to taskmanager.search.POSTGRES_DOCUMENT or the planner
+# will not use the index.
+POSTGRES_DOCUMENT = (
+    "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+
+
+def create_postgresql(cursor):
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS {POSTGRES_INDEX} "
+        f"ON {TASK_TABLE} USING GIN ({POSTGRES_DOCUMENT})"
+    )
+
+
+def drop_postgresql(cursor):
+    cursor.execute(f"DROP INDEX IF EXISTS {POSTGRES_INDEX}")
+
+
+def create_sqlite(cursor):
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+        f"title, description, content='{TASK_TABLE}', content_rowid='id')"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai "
+        f"AFTER INSERT ON {TASK_TABLE} BEGIN "
+        f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad "
+        f"AFTER DELETE ON {TASK_TABLE} BEGIN "
+        f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au "
+        f"AFTER UPDATE OF title, description ON {TASK_TABLE} BEGIN "
+        f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); END"
+    )
+    cursor.execute(
+        f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')"
+    )
+
+
+def drop_sqlite(cursor):
+    for suffix in ("ai", "ad", "au"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_{suffix}")
+    cursor.execute(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+
+
+def create_microsoft(cursor):
+    cursor.execute(
+        f"IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = '{MSSQL_CATALOG}') "
+        f"CREATE FULLTEXT CATALOG {MSSQL_CATALOG}"
+    )
+    # Full-text indexes must be keyed on a unique index by name, and Django
+    # lets SQL Server generate the primary key's name.
+    cursor.execute(
+        "SELECT name FROM sys.indexes "
+        f"WHERE object_id = OBJECT_ID('{TASK_TABLE}') AND is_primary_key = 1"
+    )
+    (key_index,) = cursor.fetchone()
+    cursor.execute(
+        f"CREATE FULLTEXT INDEX ON {TASK_TABLE} (title, description) "
+        f"KEY INDEX [{key_index}] ON {MSSQL_CATALOG} WITH CHANGE_TRACKING AUTO"
+    )
+
+
+def drop_microsoft(cursor):
+    cursor.execute(f"DROP FULLTEXT INDEX ON {TASK_TABLE}")
+    cursor.execute(f"DROP FULLTEXT CATALOG {MSSQL_CATALOG}")
+
+
+def create_search_index(apps, schema_editor):
+    handler = globals().get(f"create_{schema_editor.connection.vendor}")
+    if handler:
+        with schema_editor.connection.cursor() as cursor:
+            handler(cursor)
+
+
+def drop_search_index(apps, schema_editor):
+    handler = globals().get(f"drop_{schema_editor.connection.vendor}")
+    if handler:
+        with schema_editor.connection.cursor() as cursor:
+            handler(cursor)
+
+
+class Migration(migrations.Migration):
+    # SQL Server refuses full-text DDL inside a user transaction.
+    atomic = False
+
+    dependencies = [
+        ("taskmanager", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
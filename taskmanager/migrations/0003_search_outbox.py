@@ -0,0 +1,101 @@
+# Generated by Django 5.0.14 on 2026-10-17 21:49
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+TASK_TABLE = "taskmanager_task"
+SQLITE_FTS_TABLE = "taskmanager_task_fts"
+POSTGRES_SEARCH_TABLE = "taskmanager_task_search"
+POSTGRES_DOCUMENT = (
+    "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+
+# The synchronous index structures this migration replaces.
+initial = import_module("taskmanager.migrations.0002_task_search_index")
+
+
+def forwards_postgresql(cursor):
+    initial.drop_postgresql(cursor)
+    cursor.execute(
+        f"CREATE TABLE {POSTGRES_SEARCH_TABLE} ("
+        "task_id bigint PRIMARY KEY, document tsvector NOT NULL)"
+    )
+    cursor.execute(
+        f"CREATE INDEX {POSTGRES_SEARCH_TABLE}_document_idx "
+        f"ON {POSTGRES_SEARCH_TABLE} USING GIN (document)"
+    )
+    cursor.execute(
+        f"INSERT INTO {POSTGRES_SEARCH_TABLE} (task_id, document) "
+        f"SELECT id, {POSTGRES_DOCUMENT} FROM {TASK_TABLE}"
+    )
+
+
+def backwards_postgresql(cursor):
+    cursor.execute(f"DROP TABLE IF EXISTS {POSTGRES_SEARCH_TABLE}")
+    initial.create_postgresql(cursor)
+
+
+def forwards_sqlite(cursor):
+    # The external-content table cannot outlive its triggers: deleting a
+    # document needs the old column values, which are gone once the task row
+    # has been updated. A standalone table can be deleted from by rowid.
+    initial.drop_sqlite(cursor)
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5(title, description)"
+    )
+    cursor.execute(
+        f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, description) "
+        f"SELECT id, title, description FROM {TASK_TABLE}"
+    )
+
+
+def backwards_sqlite(cursor):
+    cursor.execute(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+    initial.create_sqlite(cursor)
+
+
+def forwards_microsoft(cursor):
+    cursor.execute(f"ALTER FULLTEXT INDEX ON {TASK_TABLE} SET CHANGE_TRACKING MANUAL")
+
+
+def backwards_microsoft(cursor):
+    cursor.execute(f"ALTER FULLTEXT INDEX ON {TASK_TABLE} SET CHANGE_TRACKING AUTO")
+
+
+def make_deferred(apps, schema_editor):
+    handler = globals().get(f"forwards_{schema_editor.connection.vendor}")
+    if handler:
+        with schema_editor.connection.cursor() as cursor:
+            handler(cursor)
+
+
+def make_synchronous(apps, schema_editor):
+    handler = globals().get(f"backwards_{schema_editor.connection.vendor}")
+    if handler:
+        with schema_editor.connection.cursor() as cursor:
+            handler(cursor)
+
+
+class Migration(migrations.Migration):
+    # SQL Server refuses full-text DDL inside a user transaction.
+    atomic = False
+
+    dependencies = [
+        ('taskmanager', '0002_task_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RunPython(make_deferred, make_synchronous),
+    ]
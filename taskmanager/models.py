@@ -1,3 +1,105 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class TaskQuerySet(models.QuerySet):
+    """Query helpers shaped to match the indexes declared on ``Task``."""
+
+    def open(self):
+        """Return tasks that are not yet done or cancelled."""
+        return self.filter(status__in=Task.Status.open_values())
+
+    def for_owner(self, owner):
+        """Return tasks belonging to ``owner``."""
+        return self.filter(owner=owner)
+
+    def for_list(self):
+        """Return the narrow column set rendered by the list view."""
+        return self.only("id", "title", "status", "priority", "due", "owner_id")
+
+
+class Task(models.Model):
+    """A single to-do item owned by a user."""
+
+    class Status(models.IntegerChoices):
+        TODO = 0, "To do"
+        IN_PROGRESS = 1, "In progress"
+        DONE = 2, "Done"
+        CANCELLED = 3, "Cancelled"
+
+        @classmethod
+        def open_values(cls):
+            return [cls.TODO, cls.IN_PROGRESS]
+
+    class Priority(models.IntegerChoices):
+        LOW = 0, "Low"
+        NORMAL = 1, "Normal"
+        HIGH = 2, "High"
+        URGENT = 3, "Urgent"
+
+    # Small integer columns keep each index entry a few bytes wide, so the
+    # hot (owner, status, due) indexes stay in memory at tens of millions of rows.
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    status = models.PositiveSmallIntegerField(choices=Status.choices, default=Status.TODO)
+    priority = models.PositiveSmallIntegerField(
+        choices=Priority.choices, default=Priority.NORMAL
+    )
+    due = models.DateField(null=True, blank=True)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tasks"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["due", "id"]
+        indexes = [
+            # Filter by owner and status, then walk in list order.
+            models.Index(
+                fields=["owner", "status", "due", "id"],
+                name="task_owner_status_due_idx",
+            ),
+            # Most reads only care about open tasks; a partial index skips
+            # the long tail of completed work entirely.
+            models.Index(
+                fields=["owner", "due", "id"],
+                name="task_open_owner_due_idx",
+                condition=models.Q(status__in=[0, 1]),
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        # Remembered so a save can tell whether it completed the task.
+        task._loaded_status = task.__dict__.get("status")
+        return task
+
+    @property
+    def is_open(self):
+        return self.status in Task.Status.open_values()
+
+
+class SearchOutbox(models.Model):
+    """A task whose search document must be refreshed by the indexer.
+
+    Rows are written in the same transaction as the task change and drained
+    in batches by ``manage.py reindex_tasks``, so saving a task never waits on
+    the full-text index.
+    """
+
+    # Not a foreign key: the row must outlive the task to remove its document.
+    task_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"Reindex task {self.task_id}"
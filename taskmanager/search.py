@@ -0,0 +1,279 @@
+"""Ranked full-text search over task titles and descriptions.
+
+Each supported database has its own native full-text engine; the backends
+below hide the differences so callers only ever use ``search_tasks``:
+
+* PostgreSQL: a ``tsvector`` side table with a GIN index.
+* SQLite: a standalone FTS5 table ranked with ``bm25``.
+* SQL Server (mssql-django): a manually tracked full-text index queried with
+  ``CONTAINSTABLE``.
+
+The index structures are created by migrations ``0002`` and ``0003``. They
+are kept current by ``taskmanager.indexer``, never by the request that saves
+a task.
+"""
+
+import re
+
+from asgiref.sync import sync_to_async
+from django.db import connections, router, transaction
+
+from .models import Task
+
+TASK_TABLE = Task._meta.db_table
+SQLITE_FTS_TABLE = f"{TASK_TABLE}_fts"
+POSTGRES_SEARCH_TABLE = f"{TASK_TABLE}_search"
+POSTGRES_CONFIG = "english"
+POSTGRES_DOCUMENT = (
+    f"to_tsvector('{POSTGRES_CONFIG}', "
+    "coalesce(title, '') || ' ' || coalesce(description, ''))"
+)
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+MAX_TERMS = 8
+
+
+def search_terms(query):
+    """Split free text into at most ``MAX_TERMS`` lower-cased word tokens.
+
+    Only word characters survive, so the terms are safe to embed in each
+    engine's query syntax without escaping.
+    """
+    return [term.lower() for term in _TERM_RE.findall(query or "")][:MAX_TERMS]
+
+
+def _placeholders(values):
+    return ", ".join(["%s"] * len(values))
+
+
+class SearchBackend:
+    """Translate search terms and index maintenance into one database's SQL."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def ranked_ids(self, terms, owner_id, limit):
+        """Return up to ``limit`` matching task ids, best match first."""
+        sql, params = self.build_sql(terms, owner_id, limit)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def build_sql(self, terms, owner_id, limit):
+        raise NotImplementedError
+
+    def refresh(self, task_ids):
+        """Re-index ``task_ids``, dropping documents for deleted tasks."""
+        raise NotImplementedError
+
+    def index_range(self, first_id, last_id):
+        """Index every task with ``first_id <= id <= last_id``.
+
+        Existing documents in the range are replaced, so this is safe to run
+        while the outbox worker refreshes the same tasks.
+        """
+        raise NotImplementedError
+
+    def prune(self):
+        """Drop the documents of tasks that no longer exist."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Drop every document from the index."""
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(SearchBackend):
+    def build_sql(self, terms, owner_id, limit):
+        # Every term is a prefix match, so "deplo" finds "deployment".
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        sql = (
+            f"SELECT task.id FROM {TASK_TABLE} AS task "
+            f"JOIN {POSTGRES_SEARCH_TABLE} AS doc ON doc.task_id = task.id, "
+            f"to_tsquery('{POSTGRES_CONFIG}', %s) AS query "
+            "WHERE task.owner_id = %s AND doc.document @@ query "
+            "ORDER BY ts_rank(doc.document, query) DESC, task.id "
+            "LIMIT %s"
+        )
+        return sql, [tsquery, owner_id, limit]
+
+    def refresh(self, task_ids):
+        # Workers may refresh the same task concurrently, so documents are
+        # upserted rather than deleted and re-inserted. Sorting keeps the
+        # order rows are locked in the same for every worker.
+        task_ids = sorted(set(task_ids))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {POSTGRES_SEARCH_TABLE} AS doc "
+                "WHERE doc.task_id = ANY(%s) AND NOT EXISTS "
+                f"(SELECT 1 FROM {TASK_TABLE} WHERE id = doc.task_id)",
+                [task_ids],
+            )
+            cursor.execute(
+                f"INSERT INTO {POSTGRES_SEARCH_TABLE} (task_id, document) "
+                f"SELECT id, {POSTGRES_DOCUMENT} FROM {TASK_TABLE} "
+                "WHERE id = ANY(%s) ORDER BY id "
+                "ON CONFLICT (task_id) DO UPDATE SET document = EXCLUDED.document",
+                [task_ids],
+            )
+
+    def index_range(self, first_id, last_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {POSTGRES_SEARCH_TABLE} (task_id, document) "
+                f"SELECT id, {POSTGRES_DOCUMENT} FROM {TASK_TABLE} "
+                "WHERE id BETWEEN %s AND %s ORDER BY id "
+                "ON CONFLICT (task_id) DO UPDATE SET document = EXCLUDED.document",
+                [first_id, last_id],
+            )
+
+    def prune(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {POSTGRES_SEARCH_TABLE} AS doc WHERE NOT EXISTS "
+                f"(SELECT 1 FROM {TASK_TABLE} WHERE id = doc.task_id)"
+            )
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {POSTGRES_SEARCH_TABLE}")
+
+
+class SqliteSearchBackend(SearchBackend):
+    def build_sql(self, terms, owner_id, limit):
+        match = " ".join(f'"{term}"*' for term in terms)
+        sql = (
+            f"SELECT task.id FROM {SQLITE_FTS_TABLE} AS fts "
+            f"JOIN {TASK_TABLE} AS task ON task.id = fts.rowid "
+            f"WHERE {SQLITE_FTS_TABLE} MATCH %s AND task.owner_id = %s "
+            # bm25() is lower-is-better; weight title matches above description.
+            f"ORDER BY bm25({SQLITE_FTS_TABLE}, 10.0, 1.0), task.id "
+            "LIMIT %s"
+        )
+        return sql, [match, owner_id, limit]
+
+    def refresh(self, task_ids):
+        task_ids = list(task_ids)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SQLITE_FTS_TABLE} "
+                f"WHERE rowid IN ({_placeholders(task_ids)})",
+                task_ids,
+            )
+            cursor.execute(
+                f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, description) "
+                f"SELECT id, title, description FROM {TASK_TABLE} "
+                f"WHERE id IN ({_placeholders(task_ids)})",
+                task_ids,
+            )
+
+    def index_range(self, first_id, last_id):
+        # FTS5 has no upsert; the caller's transaction makes this atomic.
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid BETWEEN %s AND %s",
+                [first_id, last_id],
+            )
+            cursor.execute(
+                f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, description) "
+                f"SELECT id, title, description FROM {TASK_TABLE} "
+                "WHERE id BETWEEN %s AND %s",
+                [first_id, last_id],
+            )
+
+    def prune(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SQLITE_FTS_TABLE} "
+                f"WHERE rowid NOT IN (SELECT id FROM {TASK_TABLE})"
+            )
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SQLITE_FTS_TABLE}")
+
+
+class MssqlSearchBackend(SearchBackend):
+    # SQL Server maintains the full-text index itself; with manual change
+    # tracking the indexer only decides when a population runs. Full-text DDL
+    # is not allowed inside a transaction, hence on_commit.
+
+    def build_sql(self, terms, owner_id, limit):
+        condition = " AND ".join(f'"{term}*"' for term in terms)
+        sql = (
+            f"SELECT TOP (%s) task.id FROM {TASK_TABLE} AS task "
+            f"JOIN CONTAINSTABLE({TASK_TABLE}, (title, description), %s) AS ft "
+            "ON task.id = ft.[KEY] "
+            "WHERE task.owner_id = %s "
+            "ORDER BY ft.RANK DESC, task.id"
+        )
+        return sql, [limit, condition, owner_id]
+
+    def _populate(self, kind):
+        def run():
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    f"ALTER FULLTEXT INDEX ON {TASK_TABLE} START {kind} POPULATION"
+                )
+
+        transaction.on_commit(run, using=self.connection.alias)
+
+    def refresh(self, task_ids):
+        self._populate("UPDATE")
+
+    def index_range(self, first_id, last_id):
+        pass
+
+    def prune(self):
+        # A full population rebuilds the whole index, deleted rows included.
+        self._populate("FULL")
+
+    def clear(self):
+        self._populate("FULL")
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SqliteSearchBackend,
+    "microsoft": MssqlSearchBackend,
+}
+
+
+def get_backend(using="default"):
+    """Return the search backend for the database alias ``using``.
+
+    Raises:
+        NotImplementedError: If the database has no full-text support here.
+    """
+    connection = connections[using]
+    try:
+        return BACKENDS[connection.vendor](connection)
+    except KeyError:
+        raise NotImplementedError(
+            f"Task search is not supported on {connection.vendor!r}."
+        ) from None
+
+
+def search_tasks(query, owner, limit=20, using=None):
+    """Return ``owner``'s tasks matching ``query``, most relevant first.
+
+    Runs on the database the router picks for reading tasks unless ``using``
+    is given.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    using = using or router.db_for_read(Task)
+    ids = get_backend(using).ranked_ids(terms, owner.pk, limit)
+    tasks = Task.objects.using(using).for_list().in_bulk(ids)
+    return [tasks[pk] for pk in ids if pk in tasks]
+
+
+async def asearch_tasks(query, owner, limit=20, using=None):
+    """Async version of ``search_tasks``.
+
+    The ranking query is raw SQL, which Django can only run synchronously, so
+    the whole search runs in the request's sync thread, as Django's own
+    async ORM methods do.
+    """
+    return await sync_to_async(search_tasks)(query, owner, limit=limit, using=using)
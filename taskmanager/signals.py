@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .events import broker, task_event
+from .models import SearchOutbox, Task
+
+SEARCHABLE_FIELDS = {"title", "description"}
+
+
+@receiver(post_save, sender=Task)
+def queue_saved_task(sender, instance, update_fields=None, **kwargs):
+    """Queue a search refresh unless the save left every searchable field alone."""
+    if update_fields is not None and not SEARCHABLE_FIELDS & set(update_fields):
+        return
+    SearchOutbox.objects.create(task_id=instance.pk)
+
+
+@receiver(post_delete, sender=Task)
+def queue_deleted_task(sender, instance, **kwargs):
+    SearchOutbox.objects.create(task_id=instance.pk)
+
+
+@receiver(post_save, sender=Task)
+def publish_saved_task(sender, instance, created, using, **kwargs):
+    previous_status = getattr(instance, "_loaded_status", None)
+    instance._loaded_status = instance.status
+    event = task_event(instance, created=created, previous_status=previous_status)
+    broker.publish(instance.owner_id, event, using=using)
+
+
+@receiver(post_delete, sender=Task)
+def publish_deleted_task(sender, instance, using, **kwargs):
+    broker.publish(instance.owner_id, task_event(instance, deleted=True), using=using)
@@ -0,0 +1,137 @@
+"""In-process typeahead suggestions for the task search box.
+
+Each worker process keeps a sorted array of ``(owner_id, word, task_id)``
+keys built from task titles and answers prefix lookups with ``bisect``, so
+keystrokes never reach the database. The array is topped up incrementally
+from ``Task.updated_at`` every few seconds and rebuilt from scratch
+periodically, which is also when deleted tasks drop out.
+"""
+
+import bisect
+import threading
+import time
+
+from .models import Task
+from .search import search_terms
+
+# Memory bound: only the most recently updated tasks are kept.
+MAX_TASKS = 50_000
+REFRESH_INTERVAL = 5
+REBUILD_INTERVAL = 600
+
+
+class SuggestionIndex:
+    """A bounded, per-process prefix index over task titles."""
+
+    def __init__(
+        self,
+        max_tasks=MAX_TASKS,
+        refresh_interval=REFRESH_INTERVAL,
+        rebuild_interval=REBUILD_INTERVAL,
+        clock=time.monotonic,
+    ):
+        self.max_tasks = max_tasks
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._loading = threading.Lock()
+        self._keys = []
+        self._tasks = {}
+        self._watermark = None
+        self._refreshed_at = None
+        self._rebuilt_at = None
+
+    def suggest(self, owner, prefix, limit=8):
+        """Return ``owner``'s task titles completing the last word of ``prefix``.
+
+        Titles are ordered most recently updated first.
+        """
+        terms = search_terms(prefix)
+        if not terms:
+            return []
+        term = terms[-1]
+        self._refresh_if_stale()
+        with self._lock:
+            start = bisect.bisect_left(self._keys, (owner.pk, term))
+            matches = set()
+            for owner_id, word, task_id in self._keys[start:]:
+                if owner_id != owner.pk or not word.startswith(term):
+                    break
+                matches.add(task_id)
+            ranked = sorted(matches, key=lambda pk: self._tasks[pk][2], reverse=True)
+            return [self._tasks[pk][1] for pk in ranked[:limit]]
+
+    def rebuild(self):
+        """Reload the newest ``max_tasks`` tasks, discarding everything else."""
+        rows = (
+            Task.objects.order_by("-updated_at")
+            .values_list("id", "owner_id", "title", "updated_at")[: self.max_tasks]
+        )
+        keys, tasks, watermark = [], {}, None
+        for task_id, owner_id, title, updated_at in rows:
+            tasks[task_id] = (owner_id, title, updated_at)
+            keys.extend(self._keys_for(task_id, owner_id, title))
+            watermark = max(watermark or updated_at, updated_at)
+        keys.sort()
+        now = self.clock()
+        with self._lock:
+            self._keys, self._tasks, self._watermark = keys, tasks, watermark
+            self._refreshed_at = self._rebuilt_at = now
+
+    def refresh(self):
+        """Merge tasks changed since the last load into the index."""
+        if self._watermark is None:
+            return self.rebuild()
+        rows = list(
+            # >= rather than >: rows committed later with the same timestamp
+            # are picked up, and re-merging a task is harmless.
+            Task.objects.filter(updated_at__gte=self._watermark)
+            .order_by("updated_at")
+            .values_list("id", "owner_id", "title", "updated_at")
+        )
+        with self._lock:
+            for task_id, owner_id, title, updated_at in rows:
+                self._discard(task_id)
+                self._tasks[task_id] = (owner_id, title, updated_at)
+                for key in self._keys_for(task_id, owner_id, title):
+                    bisect.insort(self._keys, key)
+                self._watermark = updated_at
+            self._refreshed_at = self.clock()
+            is_oversized = len(self._tasks) > self.max_tasks
+        if is_oversized:
+            self.rebuild()
+
+    def _refresh_if_stale(self):
+        # One thread reloads while the others answer from the current index;
+        # only the first load waits, as there is nothing to answer from yet.
+        if not self._loading.acquire(blocking=self._rebuilt_at is None):
+            return
+        try:
+            now = self.clock()
+            if (
+                self._rebuilt_at is None
+                or now - self._rebuilt_at >= self.rebuild_interval
+            ):
+                self.rebuild()
+            elif now - self._refreshed_at >= self.refresh_interval:
+                self.refresh()
+        finally:
+            self._loading.release()
+
+    def _discard(self, task_id):
+        previous = self._tasks.pop(task_id, None)
+        if previous is None:
+            return
+        owner_id, title, _ = previous
+        for key in self._keys_for(task_id, owner_id, title):
+            index = bisect.bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+
+    @staticmethod
+    def _keys_for(task_id, owner_id, title):
+        return [(owner_id, word, task_id) for word in set(search_terms(title))]
+
+
+suggestion_index = SuggestionIndex()
@@ -1,3 +1,420 @@
-from django.test import TestCase
+import threading
+from datetime import date
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.http import Http404
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from .events import RESYNC, InProcessBroker, PostgresBroker, stream_events
+from .indexer import drain_outbox, rebuild, reindex_since
+from .models import SearchOutbox, Task
+from .pagination import KeysetPaginator, decode_cursor, encode_cursor
+from .search import get_backend, search_tasks, search_terms
+from .suggestions import SuggestionIndex, suggestion_index
+from .views import (
+    TASKS_PER_PAGE,
+    atask_detail,
+    atask_list,
+    atask_search,
+    task_events,
+)
+
+REINDEX = "taskmanager.management.commands.reindex_tasks"
+
+
+class TaskModelTest(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user("owner")
+
+    def test_str_returns_title(self):
+        task = Task.objects.create(title="Write tests", owner=self.owner)
+        self.assertEqual(str(task), "Write tests")
+
+    def test_open_excludes_done_and_cancelled(self):
+        todo = Task.objects.create(title="a", owner=self.owner)
+        Task.objects.create(title="b", owner=self.owner, status=Task.Status.DONE)
+        Task.objects.create(title="c", owner=self.owner, status=Task.Status.CANCELLED)
+        self.assertQuerySetEqual(Task.objects.open(), [todo])
+        self.assertTrue(todo.is_open)
+
+    def test_partial_index_matches_open_statuses(self):
+        index = next(
+            i for i in Task._meta.indexes if i.name == "task_open_owner_due_idx"
+        )
+        self.assertEqual(
+            index.condition.children, [("status__in", Task.Status.open_values())]
+        )
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user("owner")
+        Task.objects.bulk_create(
+            [
+                Task(title=f"t{i}", owner=self.owner, due=date(2025, 1, 1 + i % 3))
+                for i in range(5)
+            ]
+            + [Task(title="undated", owner=self.owner)]
+        )
+
+    def test_pages_walk_every_task_once_in_order(self):
+        paginator = KeysetPaginator(Task.objects.all(), per_page=2)
+        seen, cursor = [], None
+        while True:
+            page = paginator.page(cursor)
+            seen.extend(page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, list(paginator.queryset))
+        self.assertEqual(seen[-1].title, "undated")
+
+    def test_undated_tail_is_only_queried_when_a_page_runs_short(self):
+        Task.objects.bulk_create(
+            Task(title=f"u{i}", owner=self.owner) for i in range(3)
+        )
+        paginator = KeysetPaginator(Task.objects.all(), per_page=2)
+        with self.assertNumQueries(1):
+            first = paginator.page()
+        cursor = encode_cursor(paginator.queryset[3])
+        with self.assertNumQueries(2):
+            boundary = paginator.page(cursor)
+        with self.assertNumQueries(1):
+            undated = paginator.page(boundary.next_cursor)
+        self.assertEqual(len(first), 2)
+        self.assertEqual([task.title for task in boundary], ["t2", "undated"])
+        self.assertEqual([task.title for task in undated], ["u0", "u1"])
+        self.assertTrue(undated.has_next)
+
+    def test_cursor_round_trips(self):
+        task = Task.objects.filter(due__isnull=False).first()
+        self.assertEqual(decode_cursor(encode_cursor(task)), (task.due, task.pk))
+
+    def test_invalid_cursor_is_bad_request(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse("taskmanager:home"), {"cursor": "%%%"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_view_shows_next_link(self):
+        Task.objects.bulk_create(
+            Task(title=f"extra{i}", owner=self.owner) for i in range(TASKS_PER_PAGE)
+        )
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse("taskmanager:home"))
+        self.assertEqual(len(response.context["page"]), TASKS_PER_PAGE)
+        self.assertContains(response, "?cursor=")
+
+
+def async_request(path, user, **params):
+    """An ASGI request as AuthenticationMiddleware would leave it for ``user``."""
+    request = AsyncRequestFactory().get(path, params)
+
+    async def auser():
+        return user
+
+    request.auser = auser
+    return request
+
+
+class TaskDetailTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user("owner")
+        self.other = User.objects.create_user("other")
+        self.task = Task.objects.create(
+            title="Deploy website", description="Push to Azure", owner=self.owner
+        )
+
+    def test_owner_sees_the_task(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse("taskmanager:detail", args=[self.task.pk]))
+        self.assertContains(response, "Push to Azure")
+
+    def test_other_users_and_visitors_get_404(self):
+        url = reverse("taskmanager:detail", args=[self.task.pk])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class AsyncTaskViewsTest(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user("owner")
+        self.task = Task.objects.create(title="Deploy website", owner=self.owner)
+        Task.objects.create(title="Write notes", owner=self.owner)
+        drain_outbox()
+
+    def get(self, path, user, **params):
+        return async_request(path, user, **params)
+
+    async def test_list_matches_the_sync_paginator(self):
+        tasks = Task.objects.for_owner(self.owner).open().for_list()
+        paginator = KeysetPaginator(tasks, per_page=1)
+        page = await paginator.apage()
+        expected = await sync_to_async(paginator.page)()
+        self.assertEqual(page.object_list, expected.object_list)
+        self.assertTrue(page.has_next)
+        response = await atask_list(self.get("/", self.owner))
+        self.assertContains(response, "Write notes")
+
+    async def test_search_and_detail(self):
+        response = await atask_search(self.get("/", self.owner, q="deploy"))
+        self.assertContains(response, "Deploy website")
+        self.assertNotContains(response, "Write notes")
+        response = await atask_detail(self.get("/", self.owner), self.task.pk)
+        self.assertContains(response, "Deploy website")
+
+    async def test_detail_is_404_for_visitors(self):
+        with self.assertRaises(Http404):
+            await atask_detail(self.get("/", AnonymousUser()), self.task.pk)
+
+
+class TaskSearchTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user("owner")
+        self.other = User.objects.create_user("other")
+        self.deploy = Task.objects.create(
+            title="Deploy website", description="Push to Azure", owner=self.owner
+        )
+        self.notes = Task.objects.create(
+            title="Write notes", description="about the deploy", owner=self.owner
+        )
+        Task.objects.create(title="Deploy elsewhere", owner=self.other)
+        drain_outbox()
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.assertEqual(search_tasks("deploy", self.owner), [self.deploy, self.notes])
+
+    def test_terms_are_prefix_matched_and_combined(self):
+        self.assertEqual(search_tasks("depl azu", self.owner), [self.deploy])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.deploy.title = "Release website"
+        self.deploy.save()
+        self.notes.delete()
+        self.assertEqual(search_tasks("release", self.owner), [])
+        drain_outbox()
+        self.assertEqual(search_tasks("release", self.owner), [self.deploy])
+        self.assertEqual(search_tasks("notes", self.owner), [])
+
+    def test_saves_only_queue_outbox_rows(self):
+        SearchOutbox.objects.all().delete()
+        self.deploy.title = "Release"
+        self.deploy.save()
+        self.deploy.save(update_fields=["status"])
+        self.assertEqual(
+            list(SearchOutbox.objects.values_list("task_id", flat=True)),
+            [self.deploy.pk],
+        )
+
+    def test_rebuild_and_since_restore_a_cleared_index(self):
+        get_backend().clear()
+        self.assertEqual(search_tasks("deploy", self.owner), [])
+        reindex_since(self.deploy.updated_at)
+        self.assertEqual(search_tasks("deploy", self.owner), [self.deploy, self.notes])
+        rebuild(batch_size=1)
+        self.assertEqual(search_tasks("deploy", self.owner), [self.deploy, self.notes])
+
+    def test_index_range_replaces_documents_refreshed_meanwhile(self):
+        backend = get_backend()
+        backend.clear()
+        self.deploy.title = "Release website"
+        self.deploy.save()
+        backend.refresh([self.deploy.pk])
+        backend.index_range(self.deploy.pk, self.notes.pk)
+        self.assertEqual(search_tasks("release", self.owner), [self.deploy])
+        self.assertEqual(search_tasks("website", self.owner), [self.deploy])
+
+    def test_rebuild_updates_in_place_and_prunes_deleted_tasks(self):
+        self.notes.delete()
+        SearchOutbox.objects.all().delete()
+        rebuild(batch_size=1)
+        self.assertEqual(search_tasks("deploy", self.owner), [self.deploy])
+
+    def test_worker_logs_failed_batches_and_keeps_going(self):
+        batches = mock.Mock(side_effect=[IntegrityError, 3, 0, KeyboardInterrupt])
+        with (
+            mock.patch("taskmanager.indexer.process_outbox", batches),
+            mock.patch(f"{REINDEX}.time.sleep") as sleep,
+            self.assertLogs(REINDEX, "ERROR"),
+        ):
+            call_command("reindex_tasks", stdout=StringIO())
+        self.assertEqual(batches.call_count, 4)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_punctuation_only_query_returns_nothing(self):
+        self.assertEqual(search_terms('"*) OR (*'), ["or"])
+        self.assertEqual(search_tasks("!!!", self.owner), [])
+
+    def test_search_view_renders_results(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse("taskmanager:search"), {"q": "deploy"})
+        self.assertEqual(response.context["tasks"], [self.deploy, self.notes])
+        self.assertContains(response, 'value="deploy"')
+
+
+class SuggestionIndexTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user("owner")
+        self.other = User.objects.create_user("other")
+        Task.objects.create(title="Deploy website", owner=self.owner)
+        Task.objects.create(title="Write deployment notes", owner=self.owner)
+        Task.objects.create(title="Deploy elsewhere", owner=self.other)
+        self.now = 0.0
+        self.index = SuggestionIndex(
+            refresh_interval=5, rebuild_interval=60, clock=lambda: self.now
+        )
+
+    def test_matches_any_title_word_for_owner_only(self):
+        self.assertCountEqual(
+            self.index.suggest(self.owner, "dep"),
+            ["Deploy website", "Write deployment notes"],
+        )
+        self.assertEqual(
+            self.index.suggest(self.owner, "write no"), ["Write deployment notes"]
+        )
+
+    def test_refresh_merges_updates_without_querying_per_keystroke(self):
+        self.index.suggest(self.owner, "dep")
+        task = Task.objects.get(title="Deploy website")
+        task.title = "Release website"
+        task.save()
+        with self.assertNumQueries(0):
+            self.assertIn("Deploy website", self.index.suggest(self.owner, "dep"))
+        self.now += 5
+        self.assertEqual(self.index.suggest(self.owner, "rel"), ["Release website"])
+        self.assertNotIn("Deploy website", self.index.suggest(self.owner, "dep"))
+
+    def test_only_one_thread_reloads_a_stale_index(self):
+        self.index.suggest(self.owner, "dep")
+        self.now += 5
+        loading, release = threading.Event(), threading.Event()
+
+        def slow_refresh():
+            loading.set()
+            release.wait(5)
+
+        with mock.patch.object(
+            self.index, "refresh", side_effect=slow_refresh
+        ) as refresh:
+            loader = threading.Thread(
+                target=self.index.suggest, args=(self.owner, "dep")
+            )
+            loader.start()
+            loading.wait(5)
+            with self.assertNumQueries(0):
+                self.assertEqual(
+                    self.index.suggest(self.owner, "web"), ["Deploy website"]
+                )
+            release.set()
+            loader.join()
+        self.assertEqual(refresh.call_count, 1)
+
+    def test_rebuild_keeps_newest_tasks_within_bound(self):
+        self.index.max_tasks = 2
+        self.index.rebuild()
+        self.assertEqual(len(self.index._tasks), 2)
+        self.assertEqual(self.index.suggest(self.other, "dep"), ["Deploy elsewhere"])
+
+    def test_suggest_view_returns_json(self):
+        suggestion_index.rebuild()
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse("taskmanager:suggest"), {"q": "web"})
+        self.assertEqual(response.json(), {"suggestions": ["Deploy website"]})
+
+
+class TaskEventsTest(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user("owner")
+
+    def test_saves_and_deletes_publish_events_to_the_owner(self):
+        with mock.patch("taskmanager.signals.broker") as broker:
+            task = Task.objects.create(title="Deploy", owner=self.owner)
+            task.title = "Deploy website"
+            task.save()
+            task.status = Task.Status.DONE
+            task.save()
+            Task.objects.get(pk=task.pk).save()
+            pk = task.pk
+            task.delete()
+        published = [call.args for call in broker.publish.call_args_list]
+        kinds = ["created", "updated", "completed", "updated", "deleted"]
+        self.assertEqual(
+            [(channel, event["type"]) for channel, event in published],
+            [(self.owner.pk, kind) for kind in kinds],
+        )
+        self.assertEqual(published[1][1]["task"]["title"], "Deploy website")
+        self.assertEqual(published[-1][1]["task"], {"id": pk})
+
+    def test_in_process_broker_publishes_on_commit(self):
+        broker = InProcessBroker()
+        with mock.patch.object(broker, "fan_out") as fan_out:
+            with self.captureOnCommitCallbacks(execute=True):
+                broker.publish(1, {"type": "created"})
+                fan_out.assert_not_called()
+        fan_out.assert_called_once_with(1, {"type": "created"})
+
+    async def test_in_process_broker_fans_out_per_channel_across_threads(self):
+        broker = InProcessBroker()
+        async with broker.subscribe(1) as mine, broker.subscribe(2) as theirs:
+            fan_out = sync_to_async(broker.fan_out, thread_sensitive=False)
+            await fan_out(1, {"type": "created"})
+            self.assertEqual(await mine.get(), {"type": "created"})
+            self.assertTrue(theirs.queue.empty())
+        self.assertEqual(broker._subscriptions, {})
+
+    async def test_slow_subscribers_are_told_to_resync(self):
+        async with InProcessBroker(queue_size=2).subscribe(1) as subscription:
+            for number in range(3):
+                subscription.deliver({"type": "updated", "n": number})
+            self.assertEqual(await subscription.get(), RESYNC)
+            self.assertTrue(subscription.queue.empty())
+
+    async def test_stream_sends_heartbeats_and_events(self):
+        broker = InProcessBroker()
+        with mock.patch("taskmanager.events.broker", broker):
+            frames = stream_events(1, heartbeat=0.01)
+            self.assertTrue((await anext(frames)).startswith("retry: "))
+            self.assertEqual(await anext(frames), ": keep-alive\n\n")
+            broker.fan_out(1, {"type": "deleted", "task": {"id": 5}})
+            self.assertEqual(
+                await anext(frames),
+                'event: deleted\ndata: {"type": "deleted", "task": {"id": 5}}\n\n',
+            )
+            await frames.aclose()
+        self.assertEqual(broker._subscriptions, {})
+
+    def test_postgres_broker_notifies_and_fans_out_notifications(self):
+        broker = PostgresBroker()
+        with mock.patch("taskmanager.events.connections") as connections:
+            broker.publish(1, {"type": "created"})
+        cursor = connections["default"].cursor.return_value.__enter__.return_value
+        sql, (channel, payload) = cursor.execute.call_args.args
+        self.assertEqual((sql, channel), ("SELECT pg_notify(%s, %s)", "task_events"))
+        with mock.patch.object(broker, "fan_out") as fan_out:
+            broker.handle_notify(payload)
+        fan_out.assert_called_once_with(1, {"type": "created"})
+
+    def test_events_are_not_streamed_under_wsgi(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse("taskmanager:events"))
+        self.assertEqual(response.status_code, 204)
+
+    @override_settings(SERVER_MODE="asgi")
+    async def test_events_stream_to_signed_in_users_under_asgi(self):
+        response = await task_events(async_request("/", AnonymousUser()))
+        self.assertEqual(response.status_code, 403)
+        response = await task_events(async_request("/", self.owner))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        frames = aiter(response.streaming_content)
+        self.assertTrue((await anext(frames)).startswith(b"retry: "))
+        await frames.aclose()
@@ -1,10 +1,35 @@
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path
 from django.views.generic import TemplateView
 
+from syafiqkaydotcom.cache import cache_public_page, conditional_page
+
+from . import views
+
 app_name = 'taskmanager'
 
+if settings.SERVER_MODE == 'asgi':
+    task_list, task_search, task_detail = (
+        views.atask_list, views.atask_search, views.atask_detail
+    )
+else:
+    task_list, task_search, task_detail = (
+        views.task_list, views.task_search, views.task_detail
+    )
+
 urlpatterns = [
-    path('', TemplateView.as_view(template_name='taskmanager/home.html'), name="home"),
-    path('help/', TemplateView.as_view(template_name='taskmanager/help.html'), name='help'),
+    path('', cache_public_page()(task_list), name="home"),
+    path('<int:pk>/', task_detail, name='detail'),
+    path('events/', views.task_events, name='events'),
+    path('search/', task_search, name='search'),
+    path('search/suggest/', views.task_suggest, name='suggest'),
+    path(
+        'help/',
+        conditional_page(
+            cache_public_page()(
+                TemplateView.as_view(template_name='taskmanager/help.html')
+            )
+        ),
+        name='help',
+    ),
 ]
@@ -1,3 +1,125 @@
-from django.shortcuts import render
+"""Task views. List, search and detail come in a sync and an async
+(``a``-prefixed) version.
 
-# Create your views here.
+``urls.py`` routes to the async versions when the site runs under ASGI (see
+``SERVER_MODE``), so a worker can wait on many slow queries at once instead
+of holding a thread for each, and to the sync versions under WSGI, where an
+async view would need an event loop per request.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import aget_object_or_404, get_object_or_404, render
+
+from .events import stream_events
+from .models import Task
+from .pagination import KeysetPaginator
+from .search import asearch_tasks, search_tasks
+from .suggestions import suggestion_index
+
+TASKS_PER_PAGE = 50
+SEARCH_RESULTS_LIMIT = 20
+
+
+def _open_tasks(user):
+    if user.is_authenticated:
+        return Task.objects.for_owner(user).open().for_list()
+    return Task.objects.none()
+
+
+def task_list(request):
+    """Display the current user's open tasks, one keyset page at a time."""
+    paginator = KeysetPaginator(_open_tasks(request.user), per_page=TASKS_PER_PAGE)
+    page = paginator.page(request.GET.get("cursor"))
+    return render(request, "taskmanager/home.html", {"page": page})
+
+
+async def atask_list(request):
+    """Async version of ``task_list``."""
+    user = await request.auser()
+    paginator = KeysetPaginator(_open_tasks(user), per_page=TASKS_PER_PAGE)
+    page = await paginator.apage(request.GET.get("cursor"))
+    return render(request, "taskmanager/home.html", {"page": page})
+
+
+def task_search(request):
+    """Display the current user's tasks that best match the ``q`` parameter."""
+    query = request.GET.get("q", "").strip()
+    tasks = []
+    if query and request.user.is_authenticated:
+        tasks = search_tasks(query, request.user, limit=SEARCH_RESULTS_LIMIT)
+    return render(
+        request, "taskmanager/search.html", {"query": query, "tasks": tasks}
+    )
+
+
+async def atask_search(request):
+    """Async version of ``task_search``."""
+    query = request.GET.get("q", "").strip()
+    tasks = []
+    user = await request.auser()
+    if query and user.is_authenticated:
+        tasks = await asearch_tasks(query, user, limit=SEARCH_RESULTS_LIMIT)
+    return render(
+        request, "taskmanager/search.html", {"query": query, "tasks": tasks}
+    )
+
+
+def task_detail(request, pk):
+    """Display one of the current user's tasks.
+
+    Raises:
+        Http404: If the task does not exist or belongs to someone else.
+    """
+    if not request.user.is_authenticated:
+        raise Http404("No such task.")
+    task = get_object_or_404(Task.objects.for_owner(request.user), pk=pk)
+    return render(request, "taskmanager/detail.html", {"task": task})
+
+
+async def atask_detail(request, pk):
+    """Async version of ``task_detail``."""
+    user = await request.auser()
+    if not user.is_authenticated:
+        raise Http404("No such task.")
+    task = await aget_object_or_404(Task.objects.for_owner(user), pk=pk)
+    return render(request, "taskmanager/detail.html", {"task": task})
+
+
+async def task_events(request):
+    """Stream the current user's task changes as Server-Sent Events.
+
+    Only served under ASGI, where an open stream costs no thread. Elsewhere
+    the 204 tells ``EventSource`` not to reconnect.
+    """
+    if settings.SERVER_MODE != "asgi":
+        return HttpResponse(status=204)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponseForbidden()
+    # The stream can stay open for hours; give the request's database
+    # connections back now rather than when it ends.
+    await sync_to_async(connections.close_all)()
+    response = StreamingHttpResponse(
+        stream_events(user.pk), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx-style proxies from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def task_suggest(request):
+    """Return typeahead suggestions for the ``q`` parameter as JSON."""
+    suggestions = []
+    if request.user.is_authenticated:
+        suggestions = suggestion_index.suggest(request.user, request.GET.get("q", ""))
+    return JsonResponse({"suggestions": suggestions})